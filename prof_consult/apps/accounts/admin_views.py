@@ -1,14 +1,24 @@
 """
 Admin API views for the consultation system.
 """
-from rest_framework import status, views
+import csv
+
+from rest_framework import generics, status, views
+from rest_framework.filters import SearchFilter
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+from django.db import connection
+from django.db.models import Avg, Count, Exists, OuterRef, Q
+from django.db.models.functions import Greatest
 from django.utils import timezone
 from datetime import timedelta
 
+from apps.accounts.models import Role
 from apps.accounts.permissions import IsAdmin
 from apps.accounts.serializers import UserSerializer, UserDetailSerializer
 from apps.consultations.models import Consultation, ConsultationStatus
@@ -17,97 +27,210 @@ from apps.professors.models import ProfessorProfile
 
 User = get_user_model()
 
+_VALID_ROLES = frozenset(Role.values)
+_VALID_ROLES_STR = ', '.join(Role.values)
+
+
+def _approx_count(model):
+    """Approximate row count from pg_class statistics (PostgreSQL only).
+
+    Exact COUNT(*) needs a full index scan under MVCC; the planner
+    estimate is O(1) and close enough for dashboard totals. Returns None
+    when no estimate is available so callers can fall back to an exact
+    count.
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class TrigramSearchFilter(SearchFilter):
+    """Search filter backed by pg_trgm similarity on PostgreSQL.
+
+    icontains search forces a full scan; with the trigram GIN index the
+    lookup stays bounded as the table grows. Other backends fall back to
+    the default icontains behaviour.
+    """
+
+    SIMILARITY_THRESHOLD = 0.3
 
-class AdminUserListView(views.APIView):
+    def filter_queryset(self, request, queryset, view):
+        search = request.query_params.get(self.search_param, '').strip()
+        if not search or connection.vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        similarities = [
+            TrigramSimilarity(field, search)
+            for field in getattr(view, 'search_fields', [])
+        ]
+        return queryset.annotate(
+            _similarity=Greatest(*similarities)
+        ).filter(_similarity__gte=self.SIMILARITY_THRESHOLD)
+
+
+class AdminUserListView(generics.ListAPIView):
     """List all users (admin only)."""
     permission_classes = [IsAuthenticated, IsAdmin]
-    
-    def get(self, request):
-        """Get all users with optional filters."""
-        users = User.objects.all()
-        
-        # Filters
-        role = request.query_params.get('role')
-        if role:
-            users = users.filter(role=role)
-        
-        department = request.query_params.get('department')
-        if department:
-            users = users.filter(department=department)
-        
-        search = request.query_params.get('search')
-        if search:
-            users = users.filter(
-                Q(email__icontains=search) |
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search)
+    serializer_class = UserDetailSerializer
+    pagination_class = LimitOffsetPagination
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    filterset_fields = ['role', 'department']
+    search_fields = ['email', 'first_name', 'last_name']
+
+    def get_queryset(self):
+        """Get all users with the profile flag annotated.
+
+        Restrict the SELECT to the columns the serializer needs; in
+        particular this skips the encrypted token columns, which would
+        otherwise be decrypted for every row. The has_professor_profile
+        flag comes back as a boolean in the same SELECT instead of a
+        reverse one-to-one join.
+        """
+        return User.objects.annotate(
+            has_professor_profile=Exists(
+                ProfessorProfile.objects.filter(user=OuterRef('pk'))
             )
-        
-        serializer = UserDetailSerializer(users, many=True)
-        return Response(serializer.data)
+        ).only(
+            'id', 'email', 'username', 'first_name', 'last_name',
+            'role', 'profile_picture', 'department', 'bio',
+            'email_opt_in', 'created_at', 'updated_at'
+        )
 
 
-class AdminConsultationListView(views.APIView):
+class AdminConsultationListView(generics.ListAPIView):
     """List all consultations (admin only)."""
     permission_classes = [IsAuthenticated, IsAdmin]
-    
-    def get(self, request):
+    serializer_class = ConsultationSerializer
+    pagination_class = LimitOffsetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = {
+        'status': ['exact'],
+        'professor_id': ['exact'],
+        'student_id': ['exact'],
+        'scheduled_date': ['gte', 'lte'],
+    }
+
+    def get_queryset(self):
         """Get all consultations with advanced filters."""
         consultations = Consultation.objects.select_related('student', 'professor').all()
-        
-        # Filters
-        status_filter = request.query_params.get('status')
-        if status_filter:
-            consultations = consultations.filter(status=status_filter)
-        
-        professor_id = request.query_params.get('professor_id')
-        if professor_id:
-            consultations = consultations.filter(professor_id=professor_id)
-        
-        student_id = request.query_params.get('student_id')
-        if student_id:
-            consultations = consultations.filter(student_id=student_id)
-        
-        date_from = request.query_params.get('date_from')
+
+        # Legacy filter aliases kept for existing API clients
+        date_from = self.request.query_params.get('date_from')
         if date_from:
             consultations = consultations.filter(scheduled_date__gte=date_from)
-        
-        date_to = request.query_params.get('date_to')
+
+        date_to = self.request.query_params.get('date_to')
         if date_to:
             consultations = consultations.filter(scheduled_date__lte=date_to)
-        
-        serializer = ConsultationSerializer(consultations, many=True)
-        return Response(serializer.data)
+
+        # "Either side" lookup. An OR of two indexed equality predicates
+        # keeps the queryset composable: the filter backends still apply
+        # their params afterwards, select_related survives, and
+        # pagination's count() works on SQLite (a UNION here broke all
+        # three).
+        user_id = self.request.query_params.get('user_id')
+        if user_id:
+            consultations = consultations.filter(
+                Q(student_id=user_id) | Q(professor_id=user_id)
+            )
+
+        return consultations
+
+
+class _EchoBuffer:
+    """Pseudo-buffer whose write() returns the value, for streaming CSV."""
+
+    def write(self, value):
+        return value
+
+
+class AdminConsultationExportView(views.APIView):
+    """Export all consultations as CSV (admin only)."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    EXPORT_FIELDS = [
+        'id', 'title', 'status', 'scheduled_date', 'scheduled_time',
+        'duration', 'student__email', 'professor__email',
+        'booking_created_at', 'rating'
+    ]
+
+    def get(self, request):
+        """Stream the full consultation table as CSV.
+
+        Rows are fetched with iterator(chunk_size=...) so memory stays
+        bounded regardless of table size.
+        """
+        queryset = Consultation.objects.order_by('id').values_list(*self.EXPORT_FIELDS)
+        writer = csv.writer(_EchoBuffer())
+
+        def rows():
+            yield writer.writerow([f.replace('__', '_') for f in self.EXPORT_FIELDS])
+            for row in queryset.iterator(chunk_size=2000):
+                yield writer.writerow(row)
+
+        response = StreamingHttpResponse(rows(), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="consultations.csv"'
+        return response
 
 
 class AdminStatisticsView(views.APIView):
     """Get dashboard statistics (admin only)."""
     permission_classes = [IsAuthenticated, IsAdmin]
-    
+
+    CACHE_KEY = 'admin_stats_v1'
+    CACHE_TTL = 60  # seconds
+
     def get(self, request):
         """Get statistics for admin dashboard."""
+        stats = cache.get(self.CACHE_KEY)
+        if stats is not None:
+            return Response(stats)
+
         now = timezone.now()
         today = now.date()
         this_month_start = today.replace(day=1)
         
-        stats = {
-            'total_users': User.objects.count(),
-            'total_students': User.objects.filter(role='STUDENT').count(),
-            'total_professors': User.objects.filter(role='PROFESSOR').count(),
-            'total_consultations': Consultation.objects.count(),
-            'pending_consultations': Consultation.objects.filter(status=ConsultationStatus.PENDING).count(),
-            'confirmed_consultations': Consultation.objects.filter(status=ConsultationStatus.CONFIRMED).count(),
-            'completed_consultations': Consultation.objects.filter(status=ConsultationStatus.COMPLETED).count(),
-            'cancelled_consultations': Consultation.objects.filter(status=ConsultationStatus.CANCELLED).count(),
-            'consultations_today': Consultation.objects.filter(scheduled_date=today).count(),
-            'consultations_this_month': Consultation.objects.filter(
-                scheduled_date__gte=this_month_start
-            ).count(),
-            'avg_rating': Consultation.objects.filter(
-                rating__isnull=False
-            ).aggregate(avg=Count('rating'))['avg'] or 0,
+        role_counts = dict(User.objects.values_list('role').annotate(n=Count('id')))
+        user_stats = {
+            'total_users': sum(role_counts.values()),
+            'total_students': role_counts.get(Role.STUDENT, 0),
+            'total_professors': role_counts.get(Role.PROFESSOR, 0),
         }
-        
+        consultation_stats = Consultation.objects.aggregate(
+            total_consultations=Count('id'),
+            pending_consultations=Count('id', filter=Q(status=ConsultationStatus.PENDING)),
+            confirmed_consultations=Count('id', filter=Q(status=ConsultationStatus.CONFIRMED)),
+            completed_consultations=Count('id', filter=Q(status=ConsultationStatus.COMPLETED)),
+            cancelled_consultations=Count('id', filter=Q(status=ConsultationStatus.CANCELLED)),
+            consultations_today=Count('id', filter=Q(scheduled_date=today)),
+            consultations_this_month=Count('id', filter=Q(scheduled_date__gte=this_month_start)),
+            avg_rating=Avg('rating'),
+        )
+
+        stats = {**user_stats, **consultation_stats}
+        stats['avg_rating'] = stats['avg_rating'] or 0
+
+        # Plain totals tolerate ~1% error; use planner estimates where
+        # available and keep exact counts for the filtered buckets.
+        approx_users = _approx_count(User)
+        if approx_users is not None:
+            stats['total_users'] = approx_users
+        approx_consultations = _approx_count(Consultation)
+        if approx_consultations is not None:
+            stats['total_consultations'] = approx_consultations
+
+        cache.set(self.CACHE_KEY, stats, self.CACHE_TTL)
+
         return Response(stats)
 
 
@@ -126,14 +249,14 @@ class AdminUpdateUserRoleView(views.APIView):
             )
         
         role = request.data.get('role')
-        if role not in [choice[0] for choice in User.Role.choices]:
+        if role not in _VALID_ROLES:
             return Response(
-                {'error': f'Invalid role. Must be one of: {[c[0] for c in User.Role.choices]}'},
+                {'error': f'Invalid role. Must be one of: {_VALID_ROLES_STR}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         user.role = role
-        user.save()
+        user.save(update_fields=['role', 'updated_at'])
         
         serializer = UserDetailSerializer(user)
         return Response(serializer.data)
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def add_trgm_index(apps, schema_editor):
+    """Create the pg_trgm GIN index for admin user search (PostgreSQL only)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS users_search_trgm_idx ON users '
+        'USING gin (email gin_trgm_ops, first_name gin_trgm_ops, last_name gin_trgm_ops)'
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS users_search_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trgm_index, drop_trgm_index),
+    ]
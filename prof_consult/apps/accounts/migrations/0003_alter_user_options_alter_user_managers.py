@@ -0,0 +1,26 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:22
+
+import apps.accounts.models
+import django.contrib.auth.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_pg_trgm_user_search'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='user',
+            options={'base_manager_name': 'with_tokens', 'ordering': ['-created_at'], 'verbose_name': 'User', 'verbose_name_plural': 'Users'},
+        ),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', apps.accounts.models.UserManager()),
+                ('with_tokens', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_options_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_email_4b85f2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_google__d35fe6_idx',
+        ),
+    ]
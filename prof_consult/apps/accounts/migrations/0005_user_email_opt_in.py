@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_remove_user_users_email_4b85f2_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_opt_in',
+            field=models.BooleanField(default=True, help_text='Whether the user wants notification emails'),
+        ),
+    ]
@@ -1,12 +1,16 @@
 """
 User models for the consultation scheduling system.
 """
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
 from django.db import models
+from django.utils.functional import cached_property
+from django.db.models.query_utils import DeferredAttribute
 from django.core.validators import EmailValidator
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from django.conf import settings
 import base64
+import functools
 import os
 
 
@@ -17,62 +21,115 @@ class Role(models.TextChoices):
     ADMIN = 'ADMIN', 'Admin'
 
 
+def _load_key():
+    """Load the configured encryption key as bytes."""
+    key = getattr(settings, 'ENCRYPTION_KEY', None)
+    if not key:
+        # For development only - in production, set this in settings
+        key = Fernet.generate_key()
+    if isinstance(key, str):
+        key = key.encode()
+    return key
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cipher():
+    """Build the AES-GCM cipher once per process.
+
+    The configured key is a urlsafe-base64 Fernet key; its decoded 32
+    bytes are used directly as the AES-256-GCM key. GCM is a single-pass
+    authenticated mode, roughly half the cost of Fernet's CBC+HMAC.
+    """
+    return AESGCM(base64.urlsafe_b64decode(_load_key()))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_legacy_cipher():
+    """Fernet cipher kept only for decrypting values written before AES-GCM."""
+    return Fernet(_load_key())
+
+
+_NONCE_SIZE = 12
+
+
 class EncryptedField:
     """Helper class for encrypting/decrypting sensitive data."""
-    
-    @staticmethod
-    def get_key():
-        """Get encryption key from settings or generate one."""
-        key = getattr(settings, 'ENCRYPTION_KEY', None)
-        if not key:
-            # For development only - in production, set this in settings
-            key = Fernet.generate_key()
-        if isinstance(key, str):
-            key = key.encode()
-        return key
-    
+
     @staticmethod
     def encrypt(value):
-        """Encrypt a string value."""
+        """Encrypt a string value as urlsafe-base64 of nonce||ciphertext."""
         if not value:
             return None
-        key = EncryptedField.get_key()
-        f = Fernet(key)
-        encrypted = f.encrypt(value.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
-    
+        nonce = os.urandom(_NONCE_SIZE)
+        ciphertext = _get_cipher().encrypt(nonce, value.encode(), None)
+        return base64.urlsafe_b64encode(nonce + ciphertext).decode()
+
     @staticmethod
     def decrypt(encrypted_value):
         """Decrypt an encrypted string value."""
         if not encrypted_value:
             return None
+        token = encrypted_value.encode()
+        try:
+            data = base64.urlsafe_b64decode(token)
+            return _get_cipher().decrypt(
+                data[:_NONCE_SIZE], data[_NONCE_SIZE:], None
+            ).decode()
+        except Exception:
+            pass
+        # Legacy Fernet tokens, including the older double-base64 wrapping
+        legacy = _get_legacy_cipher()
+        try:
+            return legacy.decrypt(token).decode()
+        except Exception:
+            pass
         try:
-            key = EncryptedField.get_key()
-            f = Fernet(key)
-            decoded = base64.urlsafe_b64decode(encrypted_value.encode())
-            decrypted = f.decrypt(decoded)
-            return decrypted.decode()
+            return legacy.decrypt(base64.urlsafe_b64decode(token)).decode()
         except Exception:
             return None
 
 
+class EncryptedFieldDescriptor(DeferredAttribute):
+    """Attribute that decrypts an encrypted column on first access.
+
+    The raw ciphertext stays on the instance as loaded from the database;
+    decryption runs only when the attribute is actually read, and the
+    plaintext is memoized per instance. Querysets that never touch the
+    encrypted columns pay no crypto cost.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        attname = self.field.attname
+        cache = instance.__dict__.setdefault('_decrypted_cache', {})
+        if attname in cache:
+            return cache[attname]
+        raw = super().__get__(instance, cls)
+        if raw is None:
+            value = None
+        else:
+            # Freshly assigned plaintext fails decryption and passes through
+            value = EncryptedField.decrypt(raw)
+            if value is None:
+                value = raw
+        cache[attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+        instance.__dict__.get('_decrypted_cache', {}).pop(self.field.attname, None)
+
+
 class EncryptedTextField(models.TextField):
-    """Text field that encrypts data before saving."""
-    
-    def from_db_value(self, value, expression, connection):
-        """Decrypt value when reading from database."""
-        if value is None:
-            return value
-        return EncryptedField.decrypt(value)
-    
+    """Text field that encrypts data before saving and decrypts lazily."""
+
+    descriptor_class = EncryptedFieldDescriptor
+
     def to_python(self, value):
         """Return value as-is for Python objects."""
-        if isinstance(value, str):
-            return value
-        if value is None:
-            return value
-        return EncryptedField.decrypt(value)
-    
+        return value
+
     def get_prep_value(self, value):
         """Encrypt value before saving to database."""
         if value is None:
@@ -80,6 +137,20 @@ class EncryptedTextField(models.TextField):
         return EncryptedField.encrypt(value)
 
 
+class UserManager(DjangoUserManager):
+    """Default manager that defers the encrypted token columns.
+
+    Most endpoints never touch the Google tokens; deferring them keeps
+    the ciphertext bytes off the wire for every ordinary user query. Use
+    ``User.with_tokens`` on paths that actually need the tokens.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer(
+            'google_access_token', 'google_refresh_token'
+        )
+
+
 class User(AbstractUser):
     """
     Custom user model extending AbstractUser.
@@ -93,6 +164,7 @@ class User(AbstractUser):
         profile_picture: URL or path to profile picture
         department: User's department
         bio: User biography
+        email_opt_in: Whether the user wants notification emails
         created_at: Account creation timestamp
         updated_at: Last update timestamp
     """
@@ -141,43 +213,54 @@ class User(AbstractUser):
         blank=True,
         help_text="User biography"
     )
+    email_opt_in = models.BooleanField(
+        default=True,
+        help_text="Whether the user wants notification emails"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
-    
+
+    objects = UserManager()
+    with_tokens = DjangoUserManager()
+
     class Meta:
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        base_manager_name = 'with_tokens'
         indexes = [
-            models.Index(fields=['email']),
+            # email and google_id get btree indexes from unique=True;
+            # duplicating them only adds write amplification.
             models.Index(fields=['role']),
-            models.Index(fields=['google_id']),
         ]
     
     def __str__(self):
         return f"{self.email} ({self.role})"
     
+    @cached_property
     def is_student(self):
         """Check if user is a student."""
         return self.role == Role.STUDENT
-    
+
+    @cached_property
     def is_professor(self):
         """Check if user is a professor."""
         return self.role == Role.PROFESSOR
-    
+
+    @cached_property
     def is_admin(self):
         """Check if user is an admin."""
         return self.role == Role.ADMIN
     
     def get_google_access_token(self):
         """Get decrypted Google access token."""
-        return EncryptedField.decrypt(self.google_access_token)
-    
+        return self.google_access_token
+
     def get_google_refresh_token(self):
         """Get decrypted Google refresh token."""
-        return EncryptedField.decrypt(self.google_refresh_token)
+        return self.google_refresh_token
 
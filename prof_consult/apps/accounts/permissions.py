@@ -3,6 +3,8 @@ Custom permissions for the consultation scheduling system.
 """
 from rest_framework import permissions
 
+from apps.accounts.models import Role
+
 
 class IsStudent(permissions.BasePermission):
     """Permission to allow only students to perform actions."""
@@ -11,7 +13,7 @@ class IsStudent(permissions.BasePermission):
         return (
             request.user and
             request.user.is_authenticated and
-            request.user.is_student()
+            getattr(request.user, 'role', None) == Role.STUDENT
         )
 
 
@@ -22,7 +24,7 @@ class IsProfessor(permissions.BasePermission):
         return (
             request.user and
             request.user.is_authenticated and
-            request.user.is_professor()
+            getattr(request.user, 'role', None) == Role.PROFESSOR
         )
 
 
@@ -33,7 +35,7 @@ class IsAdmin(permissions.BasePermission):
         return (
             request.user and
             request.user.is_authenticated and
-            request.user.is_admin()
+            getattr(request.user, 'role', None) == Role.ADMIN
         )
 
 
@@ -71,5 +73,5 @@ class IsProfessorOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
-        return request.user.is_professor()
+        return getattr(request.user, 'role', None) == Role.PROFESSOR
 
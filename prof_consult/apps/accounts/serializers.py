@@ -3,6 +3,7 @@ Serializers for accounts app.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from apps.professors.models import ProfessorProfile
 
 User = get_user_model()
@@ -16,17 +17,12 @@ class UserSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name',
             'role', 'profile_picture', 'department', 'bio',
-            'created_at', 'updated_at'
+            'email_opt_in', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
-    
-    def validate_email(self, value):
-        """Ensure email is unique."""
-        if self.instance and self.instance.email == value:
-            return value
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
+        # Uniqueness is enforced by the DB constraint and surfaced as a
+        # validation error in the view, saving a SELECT per signup.
+        extra_kwargs = {'email': {'validators': []}}
 
 
 class UserDetailSerializer(UserSerializer):
@@ -39,7 +35,13 @@ class UserDetailSerializer(UserSerializer):
     
     def get_has_professor_profile(self, obj):
         """Check if user has a professor profile."""
-        return hasattr(obj, 'professor_profile')
+        annotated = getattr(obj, 'has_professor_profile', None)
+        if annotated is not None:
+            return annotated
+        try:
+            return obj.professor_profile is not None
+        except ObjectDoesNotExist:
+            return False
 
 
 class ProfessorProfileSerializer(serializers.ModelSerializer):
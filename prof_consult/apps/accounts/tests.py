@@ -24,15 +24,15 @@ class UserModelTest(TestCase):
         """Test user creation."""
         self.assertEqual(self.user.email, 'test@example.com')
         self.assertEqual(self.user.role, 'STUDENT')
-        self.assertTrue(self.user.is_student())
+        self.assertTrue(self.user.is_student)
     
     def test_user_roles(self):
         """Test user role methods."""
         self.user.role = 'PROFESSOR'
-        self.assertTrue(self.user.is_professor())
+        self.assertTrue(self.user.is_professor)
         
         self.user.role = 'ADMIN'
-        self.assertTrue(self.user.is_admin())
+        self.assertTrue(self.user.is_admin)
 
 
 class UserAPITest(APITestCase):
@@ -53,3 +53,80 @@ class UserAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['email'], self.user.email)
 
+
+class AdminConsultationListAPITest(APITestCase):
+    """Test the admin consultation list filters."""
+
+    def setUp(self):
+        """Set up test data."""
+        from datetime import date, time, timedelta
+        from apps.consultations.models import Consultation
+
+        self.admin = User.objects.create_user(
+            email='admin@example.com',
+            username='admin',
+            password='testpass123',
+            role='ADMIN'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com',
+            username='student',
+            password='testpass123',
+            role='STUDENT'
+        )
+        self.professor = User.objects.create_user(
+            email='professor@example.com',
+            username='professor',
+            password='testpass123',
+            role='PROFESSOR'
+        )
+        self.as_student = Consultation.objects.create(
+            student=self.student,
+            professor=self.professor,
+            title='As student',
+            scheduled_date=date.today() + timedelta(days=1),
+            scheduled_time=time(10, 0),
+            duration=30
+        )
+        self.as_professor = Consultation.objects.create(
+            student=self.admin,
+            professor=self.student,
+            title='As professor',
+            scheduled_date=date.today() + timedelta(days=2),
+            scheduled_time=time(11, 0),
+            duration=30
+        )
+        self.unrelated = Consultation.objects.create(
+            student=self.admin,
+            professor=self.professor,
+            title='Unrelated',
+            scheduled_date=date.today() + timedelta(days=3),
+            scheduled_time=time(12, 0),
+            duration=30
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_user_id_matches_either_side(self):
+        """user_id returns consultations where the user is either party."""
+        response = self.client.get(
+            '/api/admin/consultations/', {'user_id': self.student.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {row['id'] for row in response.data['results']},
+            {self.as_student.id, self.as_professor.id},
+        )
+
+    def test_user_id_combines_with_filterset_params(self):
+        """user_id composes with the declared filterset params."""
+        self.as_student.confirm()
+        response = self.client.get(
+            '/api/admin/consultations/',
+            {'user_id': self.student.id, 'status': 'CONFIRMED'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['id'] for row in response.data['results']],
+            [self.as_student.id],
+        )
+
@@ -7,7 +7,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework import views as rest_views
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
 from allauth.socialaccount.models import SocialAccount
 from django.contrib.auth import login
 
@@ -15,7 +17,8 @@ from apps.accounts.serializers import UserSerializer, UserDetailSerializer
 from apps.accounts.permissions import IsOwnerOrReadOnly, IsAdmin
 from apps.accounts.admin_views import (
     AdminUserListView, AdminConsultationListView,
-    AdminStatisticsView, AdminUpdateUserRoleView
+    AdminConsultationExportView, AdminStatisticsView,
+    AdminUpdateUserRoleView
 )
 
 User = get_user_model()
@@ -45,19 +48,35 @@ class UserViewSet(viewsets.ModelViewSet):
             return [IsAdmin()]
         return super().get_permissions()
     
+    def perform_create(self, serializer):
+        """Create user, letting the unique constraint catch duplicate emails."""
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise ValidationError({'email': 'A user with this email already exists.'})
+
+    def perform_update(self, serializer):
+        """Update user, letting the unique constraint catch duplicate emails."""
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise ValidationError({'email': 'A user with this email already exists.'})
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """Get current user details."""
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
-    
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsOwnerOrReadOnly])
     def update_profile(self, request, pk=None):
         """Update user profile."""
         user = self.get_object()
         serializer = self.get_serializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
         return Response(serializer.data)
 
 
@@ -132,36 +151,45 @@ class GoogleOAuthCallbackView(rest_views.APIView):
             service = build('oauth2', 'v2', credentials=creds)
             user_info = service.userinfo().get().execute()
             
-            # Get or create user
+            # Get or create user and store the OAuth info in one write
             google_id = user_info.get('id')
             email = user_info.get('email')
-            
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    'username': email.split('@')[0],
-                    'first_name': user_info.get('given_name', ''),
-                    'last_name': user_info.get('family_name', ''),
-                    'profile_picture': user_info.get('picture', ''),
-                    'role': 'STUDENT',
-                }
-            )
-            
-            # Update Google OAuth info
-            user.google_id = google_id
-            user.google_access_token = credentials.token
+
+            defaults = {
+                'google_id': google_id,
+                'google_access_token': credentials.token,
+            }
             if credentials.refresh_token:
-                user.google_refresh_token = credentials.refresh_token
-            if not user.profile_picture:
-                user.profile_picture = user_info.get('picture', '')
-            user.save()
-            
-            # Login user
-            login(request, user)
-            
-            # Create or get auth token
+                defaults['google_refresh_token'] = credentials.refresh_token
+
+            # All Google HTTP calls are done by now; commit the user and
+            # token writes in a single transaction so no row locks are
+            # held across network round-trips.
             from rest_framework.authtoken.models import Token
-            token, created = Token.objects.get_or_create(user=user)
+
+            with transaction.atomic():
+                user, created = User.objects.update_or_create(
+                    email=email,
+                    defaults=defaults,
+                    create_defaults={
+                        **defaults,
+                        'username': email.split('@')[0],
+                        'first_name': user_info.get('given_name', ''),
+                        'last_name': user_info.get('family_name', ''),
+                        'profile_picture': user_info.get('picture', ''),
+                        'role': 'STUDENT',
+                    },
+                )
+
+                if not user.profile_picture:
+                    user.profile_picture = user_info.get('picture', '')
+                    user.save(update_fields=['profile_picture', 'updated_at'])
+
+                # Login user
+                login(request, user)
+
+                # Create or get auth token
+                token, created = Token.objects.get_or_create(user=user)
             
             serializer = UserDetailSerializer(user)
             return Response({
@@ -183,13 +211,9 @@ class LogoutView(rest_views.APIView):
     def post(self, request):
         """Logout and delete token."""
         from rest_framework.authtoken.models import Token
-        
-        try:
-            token = Token.objects.get(user=request.user)
-            token.delete()
-        except Token.DoesNotExist:
-            pass
-        
+
+        Token.objects.filter(user=request.user).delete()
+
         from django.contrib.auth import logout
         logout(request)
         
@@ -199,5 +223,6 @@ class LogoutView(rest_views.APIView):
 # Alias admin views for URL routing
 AdminUserListView = AdminUserListView
 AdminConsultationListView = AdminConsultationListView
+AdminConsultationExportView = AdminConsultationExportView
 AdminStatisticsView = AdminStatisticsView
 AdminUpdateUserRoleView = AdminUpdateUserRoleView
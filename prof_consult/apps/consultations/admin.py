@@ -8,13 +8,15 @@ from apps.consultations.models import Consultation
 @admin.register(Consultation)
 class ConsultationAdmin(admin.ModelAdmin):
     """Admin interface for Consultation model."""
+    actions = ['delete_calendar_events']
     list_display = [
         'title', 'student', 'professor', 'scheduled_date', 'scheduled_time',
-        'status', 'duration', 'rating', 'created_at'
+        'status', 'duration', 'rating', 'booking_created_at'
     ]
-    list_filter = ['status', 'scheduled_date', 'created_at']
+    list_filter = ['status', 'scheduled_date', 'booking_created_at']
+    list_select_related = ('student', 'professor')
     search_fields = ['title', 'description', 'student__email', 'professor__email']
-    readonly_fields = ['booking_created_at', 'confirmed_at', 'cancelled_at', 'created_at', 'updated_at']
+    readonly_fields = ['booking_created_at', 'confirmed_at', 'cancelled_at', 'updated_at']
     date_hierarchy = 'scheduled_date'
     
     fieldsets = (
@@ -34,7 +36,44 @@ class ConsultationAdmin(admin.ModelAdmin):
             'fields': ('notes', 'rating', 'feedback')
         }),
         ('Timestamps', {
-            'fields': ('created_at', 'updated_at')
+            'fields': ('updated_at',)
         }),
     )
 
+    @admin.action(description='Delete Google Calendar events for selected consultations')
+    def delete_calendar_events(self, request, queryset):
+        """Batch-delete the calendar events of the selected rows."""
+        from apps.integrations.services import GoogleCalendarService
+
+        consultations = list(
+            queryset.exclude(google_calendar_event_id='')
+            .select_related('professor')
+            .only('id', 'google_calendar_event_id', 'professor__id',
+                  'professor__email', 'professor__google_access_token',
+                  'professor__google_refresh_token')
+        )
+
+        # One service (and one batch stream) per professor, since events
+        # live on the professor's calendar.
+        by_professor = {}
+        for consultation in consultations:
+            by_professor.setdefault(consultation.professor, []).append(consultation)
+
+        deleted = 0
+        for professor, group in by_professor.items():
+            service = GoogleCalendarService(professor)
+            removed = service.delete_events(
+                [c.google_calendar_event_id for c in group]
+            )
+            cleared = [c.id for c in group if c.google_calendar_event_id in removed]
+            if cleared:
+                Consultation.objects.filter(id__in=cleared).update(
+                    google_calendar_event_id=''
+                )
+            deleted += len(cleared)
+
+        self.message_user(
+            request,
+            f"Deleted {deleted} Google Calendar event(s)."
+        )
+
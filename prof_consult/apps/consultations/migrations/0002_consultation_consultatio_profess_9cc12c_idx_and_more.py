@@ -0,0 +1,31 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['professor', 'scheduled_date'], name='consultatio_profess_9cc12c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['student', 'scheduled_date'], name='consultatio_student_5421b3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['status', 'scheduled_date'], name='consultatio_status_4b3b7b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['scheduled_date'], name='cons_pending_by_date'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0002_consultation_consultatio_profess_9cc12c_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='consultation',
+            name='consultatio_student_81001c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='consultation',
+            name='consultatio_profess_5ffc53_idx',
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['student', 'status', '-scheduled_date', '-scheduled_time'], name='cons_student_status_date'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['professor', 'status', '-scheduled_date', '-scheduled_time'], name='cons_professor_status_date'),
+        ),
+    ]
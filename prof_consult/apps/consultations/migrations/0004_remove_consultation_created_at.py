@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0003_remove_consultation_consultatio_student_81001c_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='consultation',
+            name='created_at',
+        ),
+    ]
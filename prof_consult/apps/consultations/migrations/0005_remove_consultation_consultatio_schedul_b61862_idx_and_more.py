@@ -0,0 +1,53 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:33
+
+from datetime import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_scheduled_datetime(apps, schema_editor):
+    Consultation = apps.get_model('consultations', 'Consultation')
+    batch = []
+    for consultation in Consultation.objects.filter(
+        scheduled_datetime__isnull=True
+    ).only('id', 'scheduled_date', 'scheduled_time').iterator(chunk_size=2000):
+        consultation.scheduled_datetime = timezone.make_aware(
+            datetime.combine(
+                consultation.scheduled_date, consultation.scheduled_time
+            )
+        )
+        batch.append(consultation)
+        if len(batch) >= 2000:
+            Consultation.objects.bulk_update(batch, ['scheduled_datetime'])
+            batch = []
+    if batch:
+        Consultation.objects.bulk_update(batch, ['scheduled_datetime'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0004_remove_consultation_created_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='consultation',
+            name='consultatio_schedul_b61862_idx',
+        ),
+        migrations.AddField(
+            model_name='consultation',
+            name='scheduled_datetime',
+            field=models.DateTimeField(editable=False, help_text='Denormalized scheduled date+time, maintained in save()', null=True),
+        ),
+        migrations.RunPython(
+            backfill_scheduled_datetime, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['scheduled_datetime'], name='consultatio_schedul_692fe3_idx'),
+        ),
+    ]
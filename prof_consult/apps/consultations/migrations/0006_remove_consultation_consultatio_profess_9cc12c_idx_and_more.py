@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0005_remove_consultation_consultatio_schedul_b61862_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='consultation',
+            name='consultatio_profess_9cc12c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['professor', 'scheduled_date', 'status'], name='consultatio_profess_ef069d_idx'),
+        ),
+    ]
@@ -40,7 +40,6 @@ class Consultation(models.Model):
         notes: Professor notes after consultation
         rating: Student rating (1-5) after completion
         feedback: Student feedback after completion
-        created_at: Record creation timestamp
         updated_at: Last update timestamp
     """
     student = models.ForeignKey(
@@ -68,6 +67,11 @@ class Consultation(models.Model):
     scheduled_time = models.TimeField(
         help_text="Scheduled time for consultation"
     )
+    scheduled_datetime = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text="Denormalized scheduled date+time, maintained in save()"
+    )
     duration = models.PositiveIntegerField(
         default=30,
         validators=[MinValueValidator(15), MaxValueValidator(240)],
@@ -133,39 +137,79 @@ class Consultation(models.Model):
         blank=True,
         help_text="Student feedback after completion"
     )
-    created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     class Meta:
         db_table = 'consultations'
         verbose_name = 'Consultation'
         verbose_name_plural = 'Consultations'
         ordering = ['-scheduled_date', '-scheduled_time']
         indexes = [
-            models.Index(fields=['student']),
-            models.Index(fields=['professor']),
             models.Index(fields=['status']),
-            models.Index(fields=['scheduled_date', 'scheduled_time']),
+            models.Index(fields=['scheduled_datetime']),
             models.Index(fields=['google_calendar_event_id']),
+            # Composite indexes matching the admin filter combinations;
+            # the trailing status column also makes the availability
+            # check (professor, date, status IN ...) a pure index range
+            # scan, and prefix use keeps the admin lookups covered.
+            models.Index(fields=['professor', 'scheduled_date', 'status']),
+            models.Index(fields=['student', 'scheduled_date']),
+            models.Index(fields=['status', 'scheduled_date']),
+            # One index per role covering the list endpoint's filter and
+            # sort; leading columns also serve plain student/professor
+            # lookups, so no single-column indexes are needed.
+            models.Index(
+                fields=['student', 'status', '-scheduled_date', '-scheduled_time'],
+                name='cons_student_status_date',
+            ),
+            models.Index(
+                fields=['professor', 'status', '-scheduled_date', '-scheduled_time'],
+                name='cons_professor_status_date',
+            ),
+            models.Index(
+                fields=['scheduled_date'],
+                condition=models.Q(status='PENDING'),
+                name='cons_pending_by_date',
+            ),
         ]
     
     def __str__(self):
-        return f"{self.title} - {self.student.email} with {self.professor.email} ({self.status})"
-    
+        # Use the raw FK ids: dereferencing student/professor here would
+        # fire hidden SELECTs every time an unprefetched row is repr'd.
+        return (
+            f"{self.title} #{self.pk} "
+            f"(student={self.student_id}, professor={self.professor_id}, {self.status})"
+        )
+
+    def save(self, *args, **kwargs):
+        """Keep the denormalized scheduled_datetime in sync."""
+        if self.scheduled_date and self.scheduled_time:
+            self.scheduled_datetime = timezone.make_aware(
+                timezone.datetime.combine(self.scheduled_date, self.scheduled_time)
+            )
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and (
+                'scheduled_date' in update_fields
+                or 'scheduled_time' in update_fields
+            ):
+                kwargs['update_fields'] = list(update_fields) + ['scheduled_datetime']
+        super().save(*args, **kwargs)
+
     def get_datetime(self):
         """Get combined scheduled date and time as datetime."""
-        from django.utils.dateparse import parse_datetime
+        if self.scheduled_datetime:
+            return self.scheduled_datetime
         return timezone.make_aware(
             timezone.datetime.combine(self.scheduled_date, self.scheduled_time)
         )
     
-    def is_past(self):
+    def is_past(self, now=None):
         """Check if consultation is in the past."""
-        return self.get_datetime() < timezone.now()
-    
-    def is_upcoming(self):
+        return self.get_datetime() < (now or timezone.now())
+
+    def is_upcoming(self, now=None):
         """Check if consultation is upcoming."""
-        return not self.is_past() and self.status in [
+        return not self.is_past(now) and self.status in [
             ConsultationStatus.PENDING,
             ConsultationStatus.CONFIRMED
         ]
@@ -186,7 +230,7 @@ class Consultation(models.Model):
         if self.status == ConsultationStatus.PENDING:
             self.status = ConsultationStatus.CONFIRMED
             self.confirmed_at = timezone.now()
-            self.save()
+            self.save(update_fields=['status', 'confirmed_at', 'updated_at'])
             return True
         return False
     
@@ -197,7 +241,9 @@ class Consultation(models.Model):
             self.cancelled_at = timezone.now()
             if reason:
                 self.cancellation_reason = reason
-            self.save()
+            self.save(update_fields=[
+                'status', 'cancelled_at', 'cancellation_reason', 'updated_at'
+            ])
             return True
         return False
     
@@ -205,7 +251,7 @@ class Consultation(models.Model):
         """Mark consultation as completed."""
         if self.status == ConsultationStatus.CONFIRMED:
             self.status = ConsultationStatus.COMPLETED
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
     
@@ -213,7 +259,7 @@ class Consultation(models.Model):
         """Mark consultation as no-show."""
         if self.status == ConsultationStatus.CONFIRMED:
             self.status = ConsultationStatus.NO_SHOW
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
 
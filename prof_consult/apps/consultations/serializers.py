@@ -3,6 +3,7 @@ Serializers for consultations app.
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from apps.consultations.models import Consultation, ConsultationStatus
 from apps.accounts.serializers import UserSerializer
 
@@ -12,16 +13,20 @@ User = get_user_model()
 class ConsultationSerializer(serializers.ModelSerializer):
     """Serializer for Consultation model."""
     
-    student = UserSerializer(read_only=True)
-    professor = UserSerializer(read_only=True)
+    student = serializers.SerializerMethodField()
+    professor = serializers.SerializerMethodField()
+    # Unfiltered querysets: the role checks live in the validate_* hooks
+    # so they reuse the row the pk lookup already fetched instead of
+    # adding a role predicate to a second query. The professor lookup
+    # joins the profile that validate() needs in the same SELECT.
     student_id = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(role='STUDENT'),
+        queryset=User.objects.all(),
         source='student',
         write_only=True,
         required=False
     )
     professor_id = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(role='PROFESSOR'),
+        queryset=User.objects.select_related('professor_profile'),
         source='professor',
         write_only=True
     )
@@ -38,55 +43,120 @@ class ConsultationSerializer(serializers.ModelSerializer):
             'duration', 'status', 'booking_created_at', 'confirmed_at',
             'cancelled_at', 'cancellation_reason', 'google_calendar_event_id',
             'meeting_link', 'location', 'notes', 'rating', 'feedback',
-            'created_at', 'updated_at', 'datetime', 'is_past',
+            'updated_at', 'datetime', 'is_past',
             'can_be_rated', 'can_be_cancelled'
         ]
         read_only_fields = [
             'id', 'status', 'booking_created_at', 'confirmed_at',
-            'cancelled_at', 'google_calendar_event_id', 'created_at',
-            'updated_at'
+            'cancelled_at', 'google_calendar_event_id', 'updated_at'
         ]
     
+    def to_representation(self, instance):
+        """Serialize with a single timestamp shared across all rows."""
+        self.context.setdefault('_now', timezone.now())
+        return super().to_representation(instance)
+
+    def _serialized_user(self, user):
+        """Serialize a user once per request.
+
+        List responses repeat the same student/professor across rows, so
+        the nested dicts are memoized by user id in the serializer
+        context.
+        """
+        cache = self.context.setdefault('_user_cache', {})
+        data = cache.get(user.pk)
+        if data is None:
+            data = UserSerializer(user, context=self.context).data
+            cache[user.pk] = data
+        return data
+
+    def get_student(self, obj):
+        """Get the nested student representation."""
+        return self._serialized_user(obj.student)
+
+    def get_professor(self, obj):
+        """Get the nested professor representation."""
+        return self._serialized_user(obj.professor)
+
     def get_datetime(self, obj):
         """Get combined scheduled date and time."""
+        if obj.scheduled_datetime:
+            return obj.scheduled_datetime.isoformat()
         return obj.get_datetime().isoformat() if obj.scheduled_date and obj.scheduled_time else None
-    
+
     def get_is_past(self, obj):
         """Check if consultation is in the past."""
-        return obj.is_past()
-    
+        annotated = getattr(obj, '_is_past', None)
+        if annotated is not None:
+            return annotated
+        return obj.is_past(now=self.context.get('_now'))
+
     def get_can_be_rated(self, obj):
         """Check if consultation can be rated."""
+        annotated = getattr(obj, '_can_be_rated', None)
+        if annotated is not None:
+            return annotated
         return obj.can_be_rated()
-    
+
     def get_can_be_cancelled(self, obj):
         """Check if consultation can be cancelled."""
+        annotated = getattr(obj, '_can_be_cancelled', None)
+        if annotated is not None:
+            return annotated
         return obj.can_be_cancelled()
     
+    def validate_student_id(self, student):
+        """Ensure the selected user is a student."""
+        if student.role != 'STUDENT':
+            raise serializers.ValidationError("Selected user is not a student.")
+        return student
+
+    def validate_professor_id(self, professor):
+        """Ensure the selected user is a professor."""
+        if professor.role != 'PROFESSOR':
+            raise serializers.ValidationError("Selected user is not a professor.")
+        return professor
+
     def validate(self, data):
         """Validate consultation data."""
         # Set student to current user if not provided
         if not data.get('student') and 'request' in self.context:
             data['student'] = self.context['request'].user
         
-        # Check if professor has availability
+        # Check max advance booking days against the profile joined in by
+        # the professor_id lookup -- no queries, one date subtraction.
         professor = data.get('professor')
-        if professor and hasattr(professor, 'professor_profile'):
-            profile = professor.professor_profile
-            
-            # Check max advance booking days
-            from django.utils import timezone
-            scheduled_date = data.get('scheduled_date')
-            if scheduled_date:
+        scheduled_date = data.get('scheduled_date')
+        if professor and scheduled_date:
+            profile = getattr(professor, 'professor_profile', None)
+            if profile is not None:
                 days_ahead = (scheduled_date - timezone.now().date()).days
                 if days_ahead > profile.max_advance_booking_days:
                     raise serializers.ValidationError(
                         f"Cannot book more than {profile.max_advance_booking_days} days in advance."
                     )
-        
+
         return data
 
 
+class ConsultationListSerializer(ConsultationSerializer):
+    """Slim serializer for consultation lists.
+
+    Leaves out the unbounded text columns (description, notes, feedback,
+    cancellation_reason) that list views never display, so list queries
+    can skip fetching them entirely.
+    """
+
+    class Meta(ConsultationSerializer.Meta):
+        fields = [
+            'id', 'student', 'professor', 'title', 'scheduled_date',
+            'scheduled_time', 'duration', 'status', 'booking_created_at',
+            'confirmed_at', 'cancelled_at', 'google_calendar_event_id',
+            'meeting_link', 'location', 'rating', 'updated_at',
+            'datetime', 'is_past', 'can_be_rated', 'can_be_cancelled'
+        ]
+
+
 class ConsultationCreateSerializer(ConsultationSerializer):
     """Serializer for creating consultations."""
     
@@ -122,3 +122,72 @@ class ConsultationAPITest(APITestCase):
         self.consultation.refresh_from_db()
         self.assertEqual(self.consultation.status, ConsultationStatus.CONFIRMED)
 
+    def test_transition_response_reflects_new_state(self):
+        """Action responses compute flags from the updated state."""
+        self.client.force_authenticate(user=self.professor)
+        self.consultation.confirm()
+        response = self.client.patch(
+            f'/api/consultations/{self.consultation.id}/complete/'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['can_be_rated'])
+        self.assertFalse(response.data['can_be_cancelled'])
+
+    def test_cancel_response_reflects_new_state(self):
+        """Cancelling reports the row as no longer cancellable."""
+        self.client.force_authenticate(user=self.professor)
+        response = self.client.patch(
+            f'/api/consultations/{self.consultation.id}/cancel/'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['can_be_cancelled'])
+
+    def test_bulk_confirm_rejects_non_integer_ids(self):
+        """bulk_confirm returns 400 for malformed id payloads."""
+        self.client.force_authenticate(user=self.professor)
+        for payload in ({}, {'ids': []}, {'ids': ['abc']}, {'ids': 'abc'}):
+            response = self.client.post(
+                '/api/consultations/bulk_confirm/', payload, format='json'
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_list_and_detail_agree_on_datetime_format(self):
+        """The list fast path renders datetimes like the serializer."""
+        self.client.force_authenticate(user=self.student)
+        listed = self.client.get('/api/consultations/').data['results'][0]
+        detail = self.client.get(
+            f'/api/consultations/{self.consultation.id}/'
+        ).data
+        for field in ('booking_created_at', 'updated_at'):
+            self.assertEqual(listed[field], detail[field])
+        self.assertEqual(
+            listed['student']['created_at'], detail['student']['created_at']
+        )
+
+    def test_list_query_count_constant(self):
+        """Listing consultations should not issue per-row queries."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_authenticate(user=self.student)
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get('/api/consultations/')
+
+        for i in range(5):
+            Consultation.objects.create(
+                student=self.student,
+                professor=self.professor,
+                title=f'Consultation {i}',
+                description='Test description',
+                scheduled_date=date.today() + timedelta(days=2 + i),
+                scheduled_time=time(10, 0),
+                duration=30
+            )
+
+        with CaptureQueriesContext(connection) as larger:
+            self.client.get('/api/consultations/')
+
+        self.assertEqual(len(baseline), len(larger))
+
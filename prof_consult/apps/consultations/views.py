@@ -1,19 +1,27 @@
 """
 Views for consultations app.
 """
+from datetime import date
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateField, DateTimeField, TimeField
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.db.models import BooleanField, Case, Value, When
+from django.db.models.functions import Now
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.consultations.models import Consultation, ConsultationStatus
 from apps.consultations.serializers import (
-    ConsultationSerializer, ConsultationCreateSerializer,
-    ConsultationUpdateSerializer, ConsultationActionSerializer,
-    ConsultationRateSerializer, ConsultationNotesSerializer
+    ConsultationSerializer, ConsultationListSerializer,
+    ConsultationCreateSerializer, ConsultationUpdateSerializer,
+    ConsultationActionSerializer, ConsultationRateSerializer,
+    ConsultationNotesSerializer
 )
 from apps.accounts.permissions import (
     IsStudent, IsProfessor, IsAdmin, IsOwnerOrProfessor
@@ -22,11 +30,56 @@ from apps.integrations.services import GoogleCalendarService
 from apps.notifications.tasks import (
     send_booking_created_notification,
     send_booking_confirmed_notification,
+    send_booking_confirmed_notification_many,
     send_booking_cancelled_notification,
     send_booking_rescheduled_notification
 )
 
 
+# Columns fetched by the values() fast path in ConsultationViewSet.list();
+# mirrors ConsultationListSerializer's output.
+_USER_COLS = (
+    'id', 'email', 'username', 'first_name', 'last_name', 'role',
+    'profile_picture', 'department', 'bio', 'email_opt_in',
+    'created_at', 'updated_at'
+)
+_LIST_COLS = (
+    'id', 'title', 'scheduled_date', 'scheduled_time',
+    'scheduled_datetime', 'duration', 'status', 'booking_created_at',
+    'confirmed_at', 'cancelled_at', 'google_calendar_event_id',
+    'meeting_link', 'location', 'rating', 'updated_at',
+    '_is_past', '_can_be_rated', '_can_be_cancelled',
+) + tuple(
+    f'{side}__{col}'
+    for side in ('student', 'professor')
+    for col in _USER_COLS
+)
+
+# Bare field instances pick up the project's DATE/TIME/DATETIME_FORMAT
+# settings, so the values() fast path renders temporals byte-for-byte
+# like the serializer path.
+_DATE_FIELD = DateField()
+_TIME_FIELD = TimeField()
+_DATETIME_FIELD = DateTimeField()
+
+
+def _fmt(field, value):
+    """Render a temporal value through the configured DRF format."""
+    return field.to_representation(value) if value is not None else None
+
+
+class ConsultationCursorPagination(CursorPagination):
+    """Keyset pagination over the list ordering.
+
+    OFFSET pagination scans and discards every earlier row on deep
+    pages; seeking on (scheduled_date, scheduled_time, id) keeps each
+    page at O(page_size) and follows the composite indexes.
+    """
+
+    page_size = 20
+    ordering = ('-scheduled_date', '-scheduled_time', '-id')
+
+
 class ConsultationViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Consultation model.
@@ -34,10 +87,11 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     queryset = Consultation.objects.all()
     serializer_class = ConsultationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ConsultationCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'professor', 'student']
     search_fields = ['title', 'description']
-    ordering_fields = ['scheduled_date', 'scheduled_time', 'created_at']
+    ordering_fields = ['scheduled_date', 'scheduled_time', 'booking_created_at']
     ordering = ['-scheduled_date', '-scheduled_time']
     
     def get_serializer_class(self):
@@ -46,36 +100,159 @@ class ConsultationViewSet(viewsets.ModelViewSet):
             return ConsultationCreateSerializer
         if self.action in ['update', 'partial_update']:
             return ConsultationUpdateSerializer
+        if self.action == 'list':
+            return ConsultationListSerializer
         return ConsultationSerializer
     
+    def _parse_date_param(self, name):
+        """Parse an ISO date query parameter, or None if absent/invalid."""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({name: 'Enter a valid date (YYYY-MM-DD).'})
+
     def get_queryset(self):
         """Filter consultations based on user role."""
         user = self.request.user
         queryset = super().get_queryset()
         
         # Filter by role
-        if user.is_student():
+        if user.is_student:
             queryset = queryset.filter(student=user)
-        elif user.is_professor():
+        elif user.is_professor:
             queryset = queryset.filter(professor=user)
-        elif not user.is_admin():
+        elif not user.is_admin:
             queryset = queryset.none()
         
         # Additional filters
         status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
-        
-        date_from = self.request.query_params.get('date_from')
+
+        # Bind real date objects so the driver sends DATE parameters and
+        # the range scan stays on the composite indexes.
+        date_from = self._parse_date_param('date_from')
         if date_from:
             queryset = queryset.filter(scheduled_date__gte=date_from)
-        
-        date_to = self.request.query_params.get('date_to')
+
+        date_to = self._parse_date_param('date_to')
         if date_to:
             queryset = queryset.filter(scheduled_date__lte=date_to)
         
-        return queryset.select_related('student', 'professor')
+        if self.action == 'list':
+            # Skip the unbounded TEXT columns the list serializer drops;
+            # they often dominate row width.
+            user_cols = [
+                'id', 'email', 'username', 'first_name', 'last_name',
+                'role', 'profile_picture', 'department', 'bio',
+                'email_opt_in', 'created_at', 'updated_at'
+            ]
+            queryset = queryset.select_related('student', 'professor').only(
+                'id', 'title', 'scheduled_date', 'scheduled_time',
+                'scheduled_datetime',
+                'duration', 'status', 'booking_created_at', 'confirmed_at',
+                'cancelled_at', 'google_calendar_event_id', 'meeting_link',
+                'location', 'rating', 'updated_at',
+                *[f'student__{col}' for col in user_cols],
+                *[f'professor__{col}' for col in user_cols],
+            )
+        else:
+            queryset = queryset.select_related(
+                'student', 'professor', 'professor__professor_profile'
+            )
+
+        # Compute the serializer's derived flags in the SELECT itself so
+        # serialization does no per-row Python state checks.
+        queryset = queryset.annotate(
+            _can_be_rated=Case(
+                When(
+                    status=ConsultationStatus.COMPLETED,
+                    rating__isnull=True,
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            _can_be_cancelled=Case(
+                When(
+                    status__in=[
+                        ConsultationStatus.PENDING,
+                        ConsultationStatus.CONFIRMED,
+                    ],
+                    then=Value(True),
+                ),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+        queryset = queryset.annotate(
+            _is_past=Case(
+                When(scheduled_datetime__lt=Now(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        )
+
+        return queryset
     
+    def _assemble_row(self, row, user_cache):
+        """Shape one values() row like ConsultationListSerializer output."""
+        def nested_user(side):
+            pk = row[f'{side}__id']
+            user = user_cache.get(pk)
+            if user is None:
+                user = {col: row[f'{side}__{col}'] for col in _USER_COLS}
+                user['created_at'] = _fmt(_DATETIME_FIELD, user['created_at'])
+                user['updated_at'] = _fmt(_DATETIME_FIELD, user['updated_at'])
+                user_cache[pk] = user
+            return user
+
+        scheduled_dt = row['scheduled_datetime']
+        return {
+            'id': row['id'],
+            'student': nested_user('student'),
+            'professor': nested_user('professor'),
+            'title': row['title'],
+            'scheduled_date': _fmt(_DATE_FIELD, row['scheduled_date']),
+            'scheduled_time': _fmt(_TIME_FIELD, row['scheduled_time']),
+            'duration': row['duration'],
+            'status': row['status'],
+            'booking_created_at': _fmt(_DATETIME_FIELD, row['booking_created_at']),
+            'confirmed_at': _fmt(_DATETIME_FIELD, row['confirmed_at']),
+            'cancelled_at': _fmt(_DATETIME_FIELD, row['cancelled_at']),
+            'google_calendar_event_id': row['google_calendar_event_id'],
+            'meeting_link': row['meeting_link'],
+            'location': row['location'],
+            'rating': row['rating'],
+            'updated_at': _fmt(_DATETIME_FIELD, row['updated_at']),
+            'datetime': scheduled_dt.isoformat() if scheduled_dt else None,
+            'is_past': bool(row['_is_past']),
+            'can_be_rated': bool(row['_can_be_rated']),
+            'can_be_cancelled': bool(row['_can_be_cancelled']),
+        }
+
+    def list(self, request, *args, **kwargs):
+        """List consultations via a values() fast path for JSON clients.
+
+        Pre-shaped dicts straight from the query skip the per-row
+        serializer machinery; the browsable API keeps the regular path.
+        """
+        renderer = getattr(request, 'accepted_renderer', None)
+        if renderer is not None and renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).values(*_LIST_COLS)
+        user_cache = {}
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = [self._assemble_row(row, user_cache) for row in page]
+            return self.get_paginated_response(data)
+        data = [self._assemble_row(row, user_cache) for row in rows]
+        return Response(data)
+
     def get_permissions(self):
         """Return appropriate permissions."""
         if self.action == 'create':
@@ -96,59 +273,166 @@ class ConsultationViewSet(viewsets.ModelViewSet):
         
         return consultation
     
+    # Annotated state flags fetched by get_object(); stale once an
+    # action UPDATEs the row underneath them.
+    _STATE_FLAGS = ('_is_past', '_can_be_rated', '_can_be_cancelled')
+
+    def _clear_state_flags(self, consultation):
+        """Drop the annotated flags after an in-place state transition.
+
+        get_object() computed them in the SELECT that ran before the
+        UPDATE, so serializing the mutated instance would report the old
+        state; without them the serializer recomputes from the instance.
+        """
+        for attr in self._STATE_FLAGS:
+            if hasattr(consultation, attr):
+                delattr(consultation, attr)
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsProfessor])
     def confirm(self, request, pk=None):
         """Confirm a consultation."""
         consultation = self.get_object()
-        
-        if consultation.status != ConsultationStatus.PENDING:
+
+        # Single-query compare-and-set: the status filter doubles as the
+        # state check, so concurrent confirms race safely on one UPDATE.
+        now = timezone.now()
+        updated = Consultation.objects.filter(
+            pk=consultation.pk,
+            status=ConsultationStatus.PENDING
+        ).update(
+            status=ConsultationStatus.CONFIRMED,
+            confirmed_at=now,
+            updated_at=now
+        )
+        if not updated:
             return Response(
                 {'error': 'Only pending consultations can be confirmed.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Confirm consultation
-        consultation.confirm()
-        
+        consultation.status = ConsultationStatus.CONFIRMED
+        consultation.confirmed_at = now
+
         # Create Google Calendar event
         calendar_service = GoogleCalendarService(consultation.professor)
         event_id = calendar_service.create_event(consultation)
         if event_id:
             consultation.google_calendar_event_id = event_id
-            consultation.save()
+            Consultation.objects.filter(pk=consultation.pk).update(
+                google_calendar_event_id=event_id,
+                updated_at=timezone.now()
+            )
         
         # Send confirmation notification
         send_booking_confirmed_notification.delay(consultation.id)
-        
+
+        self._clear_state_flags(consultation)
         serializer = self.get_serializer(consultation)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsProfessor])
+    def bulk_confirm(self, request):
+        """Confirm a batch of pending consultations.
+
+        One UPDATE transitions every matching row, one batched calendar
+        call creates all events and one broker message fans out the
+        notifications.
+        """
+        ids = request.data.get('ids')
+        if (not isinstance(ids, list) or not ids
+                or not all(type(i) is int for i in ids)):
+            return Response(
+                {'error': 'Provide a non-empty list of integer consultation ids.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        updated = Consultation.objects.filter(
+            id__in=ids,
+            professor=request.user,
+            status=ConsultationStatus.PENDING
+        ).update(
+            status=ConsultationStatus.CONFIRMED,
+            confirmed_at=now,
+            updated_at=now
+        )
+        if not updated:
+            return Response(
+                {'error': 'No pending consultations matched.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        confirmed = list(
+            Consultation.objects.filter(
+                id__in=ids,
+                professor=request.user,
+                confirmed_at=now
+            ).select_related('student', 'professor')
+        )
+
+        calendar_service = GoogleCalendarService(request.user)
+        event_ids = calendar_service.create_events(confirmed)
+        if event_ids:
+            with_events = []
+            for consultation in confirmed:
+                event_id = event_ids.get(consultation.id)
+                if event_id:
+                    consultation.google_calendar_event_id = event_id
+                    consultation.updated_at = timezone.now()
+                    with_events.append(consultation)
+            Consultation.objects.bulk_update(
+                with_events, ['google_calendar_event_id', 'updated_at']
+            )
+
+        send_booking_confirmed_notification_many.delay(
+            [consultation.id for consultation in confirmed]
+        )
+
+        return Response({
+            'confirmed': updated,
+            'ids': [consultation.id for consultation in confirmed],
+        })
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated, IsOwnerOrProfessor])
     def cancel(self, request, pk=None):
         """Cancel a consultation."""
         consultation = self.get_object()
         serializer = ConsultationActionSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        if not consultation.can_be_cancelled():
+
+        reason = serializer.validated_data.get('reason', '')
+
+        now = timezone.now()
+        changes = {
+            'status': ConsultationStatus.CANCELLED,
+            'cancelled_at': now,
+            'updated_at': now,
+        }
+        if reason:
+            changes['cancellation_reason'] = reason
+        updated = Consultation.objects.filter(
+            pk=consultation.pk,
+            status__in=[
+                ConsultationStatus.PENDING,
+                ConsultationStatus.CONFIRMED,
+            ]
+        ).update(**changes)
+        if not updated:
             return Response(
                 {'error': 'This consultation cannot be cancelled.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        reason = serializer.validated_data.get('reason', '')
-        
+        for field, value in changes.items():
+            setattr(consultation, field, value)
+
         # Delete Google Calendar event if exists
         if consultation.google_calendar_event_id:
             calendar_service = GoogleCalendarService(consultation.professor)
             calendar_service.delete_event(consultation.google_calendar_event_id)
         
-        # Cancel consultation
-        consultation.cancel(reason=reason)
-        
         # Send cancellation notification
         send_booking_cancelled_notification.delay(consultation.id, reason)
-        
+
+        self._clear_state_flags(consultation)
         serializer = self.get_serializer(consultation)
         return Response(serializer.data)
     
@@ -179,7 +463,8 @@ class ConsultationViewSet(viewsets.ModelViewSet):
         
         # Send reschedule notification
         send_booking_rescheduled_notification.delay(consultation.id)
-        
+
+        self._clear_state_flags(consultation)
         serializer = self.get_serializer(consultation)
         return Response(serializer.data)
     
@@ -187,14 +472,19 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     def complete(self, request, pk=None):
         """Mark consultation as completed."""
         consultation = self.get_object()
-        
-        if consultation.status != ConsultationStatus.CONFIRMED:
+
+        now = timezone.now()
+        updated = Consultation.objects.filter(
+            pk=consultation.pk,
+            status=ConsultationStatus.CONFIRMED
+        ).update(status=ConsultationStatus.COMPLETED, updated_at=now)
+        if not updated:
             return Response(
                 {'error': 'Only confirmed consultations can be completed.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        consultation.complete()
+        consultation.status = ConsultationStatus.COMPLETED
+        self._clear_state_flags(consultation)
         serializer = self.get_serializer(consultation)
         return Response(serializer.data)
     
@@ -202,54 +492,74 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     def no_show(self, request, pk=None):
         """Mark consultation as no-show."""
         consultation = self.get_object()
-        
-        if consultation.status != ConsultationStatus.CONFIRMED:
+
+        now = timezone.now()
+        updated = Consultation.objects.filter(
+            pk=consultation.pk,
+            status=ConsultationStatus.CONFIRMED
+        ).update(status=ConsultationStatus.NO_SHOW, updated_at=now)
+        if not updated:
             return Response(
                 {'error': 'Only confirmed consultations can be marked as no-show.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        consultation.mark_no_show()
+        consultation.status = ConsultationStatus.NO_SHOW
+        self._clear_state_flags(consultation)
         serializer = self.get_serializer(consultation)
         return Response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsProfessor])
     def notes(self, request, pk=None):
         """Add notes to consultation."""
-        consultation = self.get_object()
         serializer = ConsultationNotesSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        consultation.notes = serializer.validated_data['notes']
-        consultation.save()
-        
+
+        # Ownership lives in the row filter, so the write is one guarded
+        # UPDATE instead of SELECT + full-row save.
+        updated = Consultation.objects.filter(
+            pk=pk,
+            professor=request.user
+        ).update(
+            notes=serializer.validated_data['notes'],
+            updated_at=timezone.now()
+        )
+        if not updated:
+            return Response(
+                {'error': 'Consultation not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # The UPDATE's row filter already proved ownership; fetch the
+        # response object without re-running object permissions.
+        consultation = get_object_or_404(self.get_queryset(), pk=pk)
         response_serializer = self.get_serializer(consultation)
         return Response(response_serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, IsStudent])
     def rate(self, request, pk=None):
         """Rate a completed consultation."""
-        consultation = self.get_object()
-        
-        if consultation.student != request.user:
-            return Response(
-                {'error': 'You can only rate your own consultations.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        if not consultation.can_be_rated():
+        serializer = ConsultationRateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # One guarded UPDATE: ownership and rateability are part of the
+        # row filter, so a stale or repeated submission affects no rows.
+        updated = Consultation.objects.filter(
+            pk=pk,
+            student=request.user,
+            status=ConsultationStatus.COMPLETED,
+            rating__isnull=True
+        ).update(
+            rating=serializer.validated_data['rating'],
+            feedback=serializer.validated_data.get('feedback', ''),
+            updated_at=timezone.now()
+        )
+        if not updated:
             return Response(
                 {'error': 'This consultation cannot be rated.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        serializer = ConsultationRateSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        
-        consultation.rating = serializer.validated_data['rating']
-        consultation.feedback = serializer.validated_data.get('feedback', '')
-        consultation.save()
-        
+
+        consultation = get_object_or_404(self.get_queryset(), pk=pk)
         response_serializer = self.get_serializer(consultation)
         return Response(response_serializer.data)
 
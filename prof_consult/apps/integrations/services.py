@@ -2,8 +2,11 @@
 Google Calendar integration service.
 """
 import logging
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
@@ -15,6 +18,46 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# OAuth client config is fixed for the process lifetime; freeze it here
+# instead of rebuilding the dict from settings on every flow.
+_GOOGLE_APP = settings.SOCIALACCOUNT_PROVIDERS['google']['APP']
+_REDIRECT_URI = _GOOGLE_APP.get('redirect_uri', '')
+_CLIENT_CONFIG = {
+    "web": {
+        "client_id": _GOOGLE_APP['client_id'],
+        "client_secret": _GOOGLE_APP['secret'],
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": "https://oauth2.googleapis.com/token",
+        "redirect_uris": [_REDIRECT_URI],
+    }
+}
+
+
+@lru_cache(maxsize=512)
+def _build_service(user_id, access_token, refresh_token):
+    """Build an authenticated calendar client, memoized per token pair.
+
+    Repeated construction for the same user re-ran credential setup and
+    client building on every service instance. The tokens sit in the
+    cache key, so a refresh rotates to a fresh entry and stale ones age
+    out of the LRU.
+    """
+    creds = Credentials(
+        token=access_token,
+        refresh_token=refresh_token,
+        token_uri='https://oauth2.googleapis.com/token',
+        client_id=_GOOGLE_APP['client_id'],
+        client_secret=_GOOGLE_APP['secret'],
+    )
+    # static_discovery serves the API description from the installed
+    # client instead of fetching the discovery doc.
+    return build(
+        'calendar', 'v3',
+        credentials=creds,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
 
 class GoogleCalendarService:
     """Service for interacting with Google Calendar API."""
@@ -32,89 +75,111 @@ class GoogleCalendarService:
         self.service = None
         self._authenticate()
     
+    # Leave the cached token a minute of headroom before its expiry.
+    TOKEN_CACHE_GRACE = 60
+
     def _authenticate(self):
         """Authenticate with Google Calendar API."""
         if not self.user.google_access_token:
             logger.warning(f"User {self.user.email} does not have Google access token.")
             return None
-        
+
         try:
-            creds = Credentials(
-                token=self.user.get_google_access_token(),
-                refresh_token=self.user.get_google_refresh_token(),
-                token_uri='https://oauth2.googleapis.com/token',
-                client_id=settings.SOCIALACCOUNT_PROVIDERS['google']['APP']['client_id'],
-                client_secret=settings.SOCIALACCOUNT_PROVIDERS['google']['APP']['secret'],
-            )
-            
-            # Refresh token if expired
-            if creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-                # Update user's access token
-                self.user.google_access_token = creds.token
-                self.user.save()
-            
-            self.service = build('calendar', 'v3', credentials=creds)
+            # Decrypt the tokens once; the client itself is memoized per
+            # (user, token pair) so hot loops reuse one built service.
+            refresh_token = self.user.get_google_refresh_token()
+
+            # A cached token is known fresh, so the expiry check and the
+            # refresh roundtrip are skipped entirely while it lives.
+            cache_key = f'gcal:tok:{self.user.id}'
+            token = cache.get(cache_key)
+            if token is None:
+                creds = Credentials(
+                    token=self.user.get_google_access_token(),
+                    refresh_token=refresh_token,
+                    token_uri='https://oauth2.googleapis.com/token',
+                    client_id=_GOOGLE_APP['client_id'],
+                    client_secret=_GOOGLE_APP['secret'],
+                )
+
+                # Refresh token if expired
+                if creds.expired and creds.refresh_token:
+                    creds.refresh(Request())
+                    # Update user's access token
+                    self.user.google_access_token = creds.token
+                    self.user.save(update_fields=['google_access_token', 'updated_at'])
+
+                token = creds.token
+                if token and creds.expiry:
+                    ttl = int(creds.expiry.timestamp() - time.time()) - self.TOKEN_CACHE_GRACE
+                    if ttl > 0:
+                        cache.set(cache_key, token, ttl)
+
+            self.service = _build_service(self.user.id, token, refresh_token)
             return self.service
         except Exception as e:
             logger.error(f"Failed to authenticate Google Calendar for user {self.user.email}: {str(e)}")
             return None
     
+    def _build_event_body(self, consultation):
+        """Build the Google Calendar event payload for a consultation."""
+        start_datetime = consultation.get_datetime()
+        end_datetime = start_datetime + timedelta(minutes=consultation.duration)
+
+        event = {
+            'summary': f'Consultation: {consultation.title}',
+            'description': consultation.description,
+            'start': {
+                'dateTime': start_datetime.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'end': {
+                'dateTime': end_datetime.isoformat(),
+                'timeZone': 'UTC',
+            },
+            'attendees': [
+                {'email': consultation.student.email},
+                {'email': consultation.professor.email},
+            ],
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},  # 24 hours before
+                    {'method': 'popup', 'minutes': 60},  # 1 hour before
+                ],
+            },
+        }
+
+        if consultation.location:
+            event['location'] = consultation.location
+
+        if consultation.meeting_link:
+            event['description'] += f'\n\nMeeting Link: {consultation.meeting_link}'
+
+        return event
+
     def create_event(self, consultation):
         """
         Create a Google Calendar event for a consultation.
-        
+
         Args:
             consultation: Consultation instance
-            
+
         Returns:
             Event ID if successful, None otherwise
         """
         if not self.service:
             logger.error("Google Calendar service not authenticated.")
             return None
-        
+
         try:
-            start_datetime = consultation.get_datetime()
-            end_datetime = start_datetime + timedelta(minutes=consultation.duration)
-            
-            event = {
-                'summary': f'Consultation: {consultation.title}',
-                'description': consultation.description,
-                'start': {
-                    'dateTime': start_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'end': {
-                    'dateTime': end_datetime.isoformat(),
-                    'timeZone': 'UTC',
-                },
-                'attendees': [
-                    {'email': consultation.student.email},
-                    {'email': consultation.professor.email},
-                ],
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},  # 24 hours before
-                        {'method': 'popup', 'minutes': 60},  # 1 hour before
-                    ],
-                },
-            }
-            
-            if consultation.location:
-                event['location'] = consultation.location
-            
-            if consultation.meeting_link:
-                event['description'] += f'\n\nMeeting Link: {consultation.meeting_link}'
-            
             calendar_id = getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary')
             event = self.service.events().insert(
                 calendarId=calendar_id,
-                body=event,
+                body=self._build_event_body(consultation),
                 sendUpdates='all'
             ).execute()
-            
+
             logger.info(f"Created Google Calendar event {event['id']} for consultation {consultation.id}")
             return event['id']
         except HttpError as e:
@@ -123,6 +188,56 @@ class GoogleCalendarService:
         except Exception as e:
             logger.error(f"Unexpected error creating Google Calendar event: {str(e)}")
             return None
+
+    def create_events(self, consultations):
+        """
+        Create Google Calendar events for several consultations at once.
+
+        All inserts go out in a single batch HTTP request instead of one
+        roundtrip per consultation.
+
+        Args:
+            consultations: iterable of Consultation instances
+
+        Returns:
+            Dict mapping consultation id to created event ID; failed
+            inserts are omitted.
+        """
+        if not self.service:
+            logger.error("Google Calendar service not authenticated.")
+            return {}
+
+        event_ids = {}
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                logger.error(
+                    f"Failed to create Google Calendar event for "
+                    f"consultation {request_id}: {str(exception)}"
+                )
+                return
+            event_ids[int(request_id)] = response['id']
+
+        try:
+            calendar_id = getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary')
+            batch = self.service.new_batch_http_request(callback=collect)
+            for consultation in consultations:
+                batch.add(
+                    self.service.events().insert(
+                        calendarId=calendar_id,
+                        body=self._build_event_body(consultation),
+                        sendUpdates='all'
+                    ),
+                    request_id=str(consultation.id)
+                )
+            batch.execute()
+        except HttpError as e:
+            logger.error(f"Failed to execute Google Calendar batch: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error creating Google Calendar events: {str(e)}")
+
+        logger.info(f"Created {len(event_ids)} Google Calendar events in one batch")
+        return event_ids
     
     def update_event(self, consultation):
         """
@@ -140,32 +255,36 @@ class GoogleCalendarService:
         try:
             start_datetime = consultation.get_datetime()
             end_datetime = start_datetime + timedelta(minutes=consultation.duration)
-            
-            event = self.service.events().get(
-                calendarId=getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary'),
-                eventId=consultation.google_calendar_event_id
-            ).execute()
-            
-            event['summary'] = f'Consultation: {consultation.title}'
-            event['description'] = consultation.description
-            event['start']['dateTime'] = start_datetime.isoformat()
-            event['start']['timeZone'] = 'UTC'
-            event['end']['dateTime'] = end_datetime.isoformat()
-            event['end']['timeZone'] = 'UTC'
-            
-            if consultation.location:
-                event['location'] = consultation.location
-            
+
+            description = consultation.description
             if consultation.meeting_link:
-                event['description'] += f'\n\nMeeting Link: {consultation.meeting_link}'
-            
-            updated_event = self.service.events().update(
+                description += f'\n\nMeeting Link: {consultation.meeting_link}'
+
+            # Patch only the fields we own; no GET roundtrip to rebuild
+            # the full event body.
+            body = {
+                'summary': f'Consultation: {consultation.title}',
+                'description': description,
+                'start': {
+                    'dateTime': start_datetime.isoformat(),
+                    'timeZone': 'UTC',
+                },
+                'end': {
+                    'dateTime': end_datetime.isoformat(),
+                    'timeZone': 'UTC',
+                },
+            }
+
+            if consultation.location:
+                body['location'] = consultation.location
+
+            updated_event = self.service.events().patch(
                 calendarId=getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary'),
                 eventId=consultation.google_calendar_event_id,
-                body=event,
+                body=body,
                 sendUpdates='all'
             ).execute()
-            
+
             logger.info(f"Updated Google Calendar event {updated_event['id']} for consultation {consultation.id}")
             return True
         except HttpError as e:
@@ -207,24 +326,73 @@ class GoogleCalendarService:
             logger.error(f"Unexpected error deleting Google Calendar event: {str(e)}")
             return False
 
+    # Google caps batch requests at 50 calls each.
+    BATCH_SIZE = 50
+
+    def delete_events(self, event_ids):
+        """
+        Delete several Google Calendar events in batched requests.
+
+        Deletes go out in batches of up to 50 instead of one roundtrip
+        per event, so bulk cancellations (e.g. semester-end sweeps) cost
+        ceil(N/50) requests.
+
+        Args:
+            event_ids: iterable of Google Calendar event IDs
+
+        Returns:
+            Set of event IDs that were deleted (a 404 counts as
+            deleted, matching delete_event).
+        """
+        if not self.service:
+            logger.error("Google Calendar service not authenticated.")
+            return set()
+
+        deleted = set()
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                if isinstance(exception, HttpError) and exception.resp.status == 404:
+                    logger.warning(
+                        f"Google Calendar event {request_id} not found (already deleted?)"
+                    )
+                    deleted.add(request_id)
+                    return
+                logger.error(
+                    f"Failed to delete Google Calendar event {request_id}: {str(exception)}"
+                )
+                return
+            deleted.add(request_id)
+
+        event_ids = list(event_ids)
+        calendar_id = getattr(settings, 'GOOGLE_CALENDAR_ID', 'primary')
+        try:
+            for start in range(0, len(event_ids), self.BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=collect)
+                for event_id in event_ids[start:start + self.BATCH_SIZE]:
+                    batch.add(
+                        self.service.events().delete(
+                            calendarId=calendar_id,
+                            eventId=event_id,
+                            sendUpdates='all'
+                        ),
+                        request_id=event_id
+                    )
+                batch.execute()
+        except HttpError as e:
+            logger.error(f"Failed to execute Google Calendar batch: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error deleting Google Calendar events: {str(e)}")
+
+        logger.info(f"Deleted {len(deleted)} of {len(event_ids)} Google Calendar events")
+        return deleted
+
 
 def get_google_oauth_flow():
     """Get Google OAuth flow for authentication."""
-    client_config = {
-        "web": {
-            "client_id": settings.SOCIALACCOUNT_PROVIDERS['google']['APP']['client_id'],
-            "client_secret": settings.SOCIALACCOUNT_PROVIDERS['google']['APP']['secret'],
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": [settings.SOCIALACCOUNT_PROVIDERS['google']['APP'].get('redirect_uri', '')]
-        }
-    }
-    
-    flow = Flow.from_client_config(
-        client_config,
+    return Flow.from_client_config(
+        _CLIENT_CONFIG,
         scopes=GoogleCalendarService.SCOPES,
-        redirect_uri=settings.SOCIALACCOUNT_PROVIDERS['google']['APP'].get('redirect_uri', '')
+        redirect_uri=_REDIRECT_URI,
     )
-    
-    return flow
 
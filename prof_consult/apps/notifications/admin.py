@@ -13,6 +13,7 @@ class NotificationAdmin(admin.ModelAdmin):
         'sent_at', 'read_at', 'created_at'
     ]
     list_filter = ['notification_type', 'message_type', 'email_status', 'created_at']
+    list_select_related = ('user', 'consultation')
     search_fields = ['user__email', 'consultation__title']
     readonly_fields = ['sent_at', 'read_at', 'created_at']
     date_hierarchy = 'created_at'
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0005_remove_consultation_consultatio_schedul_b61862_idx_and_more'),
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('read_at__isnull', True)), fields=['user'], name='notif_unread_by_user_idx'),
+        ),
+    ]
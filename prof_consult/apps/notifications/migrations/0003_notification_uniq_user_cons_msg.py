@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0005_remove_consultation_consultatio_schedul_b61862_idx_and_more'),
+        ('notifications', '0002_notification_notif_unread_by_user_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('consultation__isnull', False)), fields=('user', 'consultation', 'message_type'), name='uniq_user_cons_msg'),
+        ),
+    ]
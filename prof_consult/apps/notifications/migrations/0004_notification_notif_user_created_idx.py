@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-26 07:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0005_remove_consultation_consultatio_schedul_b61862_idx_and_more'),
+        ('notifications', '0003_notification_uniq_user_cons_msg'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-26 08:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultations', '0006_remove_consultation_consultatio_profess_9cc12c_idx_and_more'),
+        ('notifications', '0004_notification_notif_user_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='notification',
+            name='uniq_user_cons_msg',
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('consultation__isnull', False), ('message_type', 'REMINDER_24H')), fields=('user', 'consultation', 'message_type'), name='uniq_user_cons_msg'),
+        ),
+    ]
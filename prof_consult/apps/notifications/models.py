@@ -3,9 +3,24 @@ Notification models for the consultation system.
 """
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
 
+def unread_count_cache_key(user_id):
+    """Cache key for a user's unread notification badge count."""
+    return f'notif:unread:{user_id}'
+
+
+def invalidate_unread_counts(user_ids):
+    """Drop the cached unread badge counts for the given users.
+
+    Called by every write path that changes unread state so the badge
+    never serves a stale count for longer than one request.
+    """
+    cache.delete_many([unread_count_cache_key(user_id) for user_id in set(user_ids)])
+
+
 class NotificationType(models.TextChoices):
     """Notification type choices."""
     EMAIL = 'EMAIL', 'Email'
@@ -95,32 +110,73 @@ class Notification(models.Model):
             models.Index(fields=['notification_type']),
             models.Index(fields=['email_status']),
             models.Index(fields=['read_at']),
+            # Unread badge + mark_all_read predicate; stays tiny because
+            # read rows drop out of it.
+            models.Index(
+                fields=['user'],
+                condition=models.Q(read_at__isnull=True),
+                name='notif_unread_by_user_idx',
+            ),
+            # Backs cursor pagination of a user's feed: the cursor
+            # predicate plus ordering resolve on this index alone.
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='notif_user_created_idx',
+            ),
+        ]
+        constraints = [
+            # Lets the reminder sweep dedupe with
+            # bulk_create(ignore_conflicts=True) instead of per-row
+            # get_or_create guards. Scoped to REMINDER_24H only: other
+            # events (reschedules, cancellations) can legitimately recur
+            # for the same consultation and must notify every time.
+            models.UniqueConstraint(
+                fields=['user', 'consultation', 'message_type'],
+                name='uniq_user_cons_msg',
+                condition=models.Q(
+                    consultation__isnull=False,
+                    message_type='REMINDER_24H',
+                ),
+            ),
         ]
     
     def __str__(self):
         return f"{self.message_type} - {self.user.email} ({self.notification_type})"
     
     def mark_as_read(self):
-        """Mark notification as read."""
-        if not self.read_at and self.notification_type == NotificationType.IN_APP:
-            self.read_at = timezone.now()
-            self.save()
-            return True
-        return False
-    
+        """Mark notification as read.
+
+        The state check is part of the UPDATE's row filter, so two
+        workers racing on the same row can't both succeed.
+        """
+        now = timezone.now()
+        updated = Notification.objects.filter(
+            pk=self.pk,
+            read_at__isnull=True,
+            notification_type=NotificationType.IN_APP
+        ).update(read_at=now)
+        if updated:
+            self.read_at = now
+        return bool(updated)
+
     def mark_as_sent(self):
         """Mark notification as sent."""
-        if not self.sent_at:
-            self.sent_at = timezone.now()
+        now = timezone.now()
+        updated = Notification.objects.filter(
+            pk=self.pk,
+            sent_at__isnull=True
+        ).update(sent_at=now, email_status=EmailStatus.SENT)
+        if updated:
+            self.sent_at = now
             self.email_status = EmailStatus.SENT
-            self.save()
-            return True
-        return False
-    
+        return bool(updated)
+
     def mark_as_failed(self):
         """Mark notification as failed."""
+        Notification.objects.filter(pk=self.pk).update(
+            email_status=EmailStatus.FAILED
+        )
         self.email_status = EmailStatus.FAILED
-        self.save()
         return True
     
     def is_read(self):
@@ -11,8 +11,12 @@ class NotificationSerializer(serializers.ModelSerializer):
     message_type_display = serializers.CharField(source='get_message_type_display', read_only=True)
     notification_type_display = serializers.CharField(source='get_notification_type_display', read_only=True)
     email_status_display = serializers.CharField(source='get_email_status_display', read_only=True)
-    consultation_title = serializers.SerializerMethodField()
-    is_read = serializers.SerializerMethodField()
+    # Both resolve inside the list SELECT: the title via the joined
+    # consultation row, is_read via the queryset annotation.
+    consultation_title = serializers.CharField(
+        source='consultation.title', default=None, read_only=True
+    )
+    is_read = serializers.BooleanField(source='is_read_db', read_only=True)
     
     class Meta:
         model = Notification
@@ -25,12 +29,4 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'user', 'sent_at', 'read_at', 'email_status', 'created_at'
         ]
-    
-    def get_consultation_title(self, obj):
-        """Get consultation title if available."""
-        return obj.consultation.title if obj.consultation else None
-    
-    def get_is_read(self, obj):
-        """Check if notification is read."""
-        return obj.is_read()
 
@@ -2,19 +2,112 @@
 Celery tasks for notification system.
 """
 import logging
+from functools import lru_cache
+
 from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 
-from apps.notifications.models import Notification, NotificationType, MessageType, EmailStatus
+from apps.notifications.models import (
+    Notification, NotificationType, MessageType, EmailStatus,
+    invalidate_unread_counts,
+)
 from apps.consultations.models import Consultation, ConsultationStatus
 from apps.integrations.services import GoogleCalendarService
 
 logger = logging.getLogger(__name__)
 
+# Email templates and subjects by message type, frozen at module scope.
+TEMPLATE_PATHS = {
+    MessageType.BOOKING_CREATED: 'emails/booking_created.html',
+    MessageType.BOOKING_CONFIRMED: 'emails/booking_confirmed.html',
+    MessageType.REMINDER_24H: 'emails/reminder_24h.html',
+    MessageType.CANCELLED: 'emails/booking_cancelled.html',
+    MessageType.RESCHEDULED: 'emails/booking_rescheduled.html',
+}
+DEFAULT_TEMPLATE_PATH = 'emails/notification.html'
+
+SUBJECTS = {
+    MessageType.BOOKING_CREATED: 'New Consultation Booking',
+    MessageType.BOOKING_CONFIRMED: 'Consultation Confirmed',
+    MessageType.REMINDER_24H: 'Reminder: Consultation Tomorrow',
+    MessageType.CANCELLED: 'Consultation Cancelled',
+    MessageType.RESCHEDULED: 'Consultation Rescheduled',
+}
+DEFAULT_SUBJECT = 'Consultation Notification'
+
+
+@lru_cache(maxsize=None)
+def _get_templates(message_type):
+    """Get the compiled (html, txt) templates for a message type.
+
+    Compiled once per process; rendering is then pure context
+    substitution instead of a loader resolution and parse per email.
+    """
+    path = TEMPLATE_PATHS.get(message_type, DEFAULT_TEMPLATE_PATH)
+    return get_template(path), get_template(path.replace('.html', '.txt'))
+
+
+def _get_consultation(consultation_id):
+    """Fetch a consultation with both parties in one narrow SELECT."""
+    return Consultation.objects.select_related('student', 'professor').only(
+        'id', 'title', 'description', 'status', 'duration',
+        'scheduled_date', 'scheduled_time', 'location', 'meeting_link',
+        'cancellation_reason',
+        'student__id', 'student__email', 'student__first_name',
+        'student__last_name', 'student__role',
+        'professor__id', 'professor__email', 'professor__first_name',
+        'professor__last_name', 'professor__role',
+    ).get(id=consultation_id)
+
+
+def _build_email_message(notification, extra_context=None, connection=None):
+    """
+    Build the rendered email for a notification.
+
+    Args:
+        notification: Notification instance (user/consultation loaded)
+        extra_context: Additional context for the email template
+        connection: Email connection to attach the message to
+
+    Returns:
+        EmailMultiAlternatives ready to send
+    """
+    consultation = notification.consultation
+    user = notification.user
+
+    context = {
+        'user': user,
+        'consultation': consultation,
+        'message_type': notification.message_type,
+        'site_name': getattr(settings, 'SITE_NAME', 'Consultation System'),
+        'site_url': getattr(settings, 'SITE_URL', 'http://localhost:8000'),
+    }
+
+    if extra_context:
+        context.update(extra_context)
+
+    subject = SUBJECTS.get(notification.message_type, DEFAULT_SUBJECT)
+
+    # Render email from the pre-compiled templates
+    html_template, plain_template = _get_templates(notification.message_type)
+    html_message = html_template.render(context)
+    plain_message = plain_template.render(context)
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=plain_message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection,
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
 
 @shared_task
 def send_booking_created_notification(consultation_id):
@@ -25,33 +118,27 @@ def send_booking_created_notification(consultation_id):
         consultation_id: ID of the consultation
     """
     try:
-        consultation = Consultation.objects.get(id=consultation_id)
+        consultation = _get_consultation(consultation_id)
     except Consultation.DoesNotExist:
         logger.error(f"Consultation {consultation_id} does not exist.")
         return
     
-    # Notify student
-    student_notification = Notification.objects.create(
-        user=consultation.student,
-        consultation=consultation,
-        notification_type=NotificationType.IN_APP,
-        message_type=MessageType.BOOKING_CREATED
-    )
-    
-    # Notify professor
-    professor_notification = Notification.objects.create(
-        user=consultation.professor,
-        consultation=consultation,
-        notification_type=NotificationType.IN_APP,
-        message_type=MessageType.BOOKING_CREATED
-    )
-    
-    # Send email to student
-    send_email_notification.delay(student_notification.id)
-    
-    # Send email to professor
-    send_email_notification.delay(professor_notification.id)
+    # Notify student and professor in one INSERT
+    Notification.objects.bulk_create([
+        Notification(
+            user=user,
+            consultation=consultation,
+            notification_type=NotificationType.IN_APP,
+            message_type=MessageType.BOOKING_CREATED
+        )
+        for user in [consultation.student, consultation.professor]
+    ])
+    invalidate_unread_counts([consultation.student_id, consultation.professor_id])
     
+    # Emails go out through the pooled sender, debounced slightly so a
+    # burst of bookings shares one SMTP connection.
+    send_pending_emails.apply_async(countdown=2)
+
     logger.info(f"Created notifications for consultation {consultation_id}")
 
 
@@ -64,7 +151,7 @@ def send_booking_confirmed_notification(consultation_id):
         consultation_id: ID of the consultation
     """
     try:
-        consultation = Consultation.objects.get(id=consultation_id)
+        consultation = _get_consultation(consultation_id)
     except Consultation.DoesNotExist:
         logger.error(f"Consultation {consultation_id} does not exist.")
         return
@@ -76,13 +163,47 @@ def send_booking_confirmed_notification(consultation_id):
         notification_type=NotificationType.IN_APP,
         message_type=MessageType.BOOKING_CONFIRMED
     )
+    invalidate_unread_counts([consultation.student_id])
     
     # Send email
-    send_email_notification.delay(notification.id)
-    
+    send_pending_emails.apply_async(countdown=2)
+
     logger.info(f"Sent confirmation notification for consultation {consultation_id}")
 
 
+@shared_task
+def send_booking_confirmed_notification_many(consultation_ids):
+    """
+    Send confirmation notifications for a batch of consultations.
+
+    Bulk flows enqueue this once with the whole id list instead of one
+    broker publish per row.
+
+    Args:
+        consultation_ids: list of consultation IDs
+    """
+    consultations = Consultation.objects.filter(
+        id__in=consultation_ids
+    ).select_related('student')
+
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            user=consultation.student,
+            consultation=consultation,
+            notification_type=NotificationType.IN_APP,
+            message_type=MessageType.BOOKING_CONFIRMED
+        )
+        for consultation in consultations
+    ])
+    invalidate_unread_counts([c.student_id for c in consultations])
+
+    send_pending_emails.apply_async(countdown=2)
+
+    logger.info(
+        f"Sent confirmation notifications for {len(notifications)} consultations"
+    )
+
+
 @shared_task
 def send_booking_cancelled_notification(consultation_id, reason=''):
     """
@@ -93,21 +214,26 @@ def send_booking_cancelled_notification(consultation_id, reason=''):
         reason: Reason for cancellation
     """
     try:
-        consultation = Consultation.objects.get(id=consultation_id)
+        consultation = _get_consultation(consultation_id)
     except Consultation.DoesNotExist:
         logger.error(f"Consultation {consultation_id} does not exist.")
         return
     
-    # Notify both parties
-    for user in [consultation.student, consultation.professor]:
-        notification = Notification.objects.create(
+    # Notify both parties in one INSERT. The templates read the reason
+    # from consultation.cancellation_reason, which cancel() persisted
+    # before this task ran, so the pooled sender needs no extra context.
+    Notification.objects.bulk_create([
+        Notification(
             user=user,
             consultation=consultation,
             notification_type=NotificationType.IN_APP,
             message_type=MessageType.CANCELLED
         )
-        send_email_notification.delay(notification.id, extra_context={'reason': reason})
-    
+        for user in [consultation.student, consultation.professor]
+    ])
+    invalidate_unread_counts([consultation.student_id, consultation.professor_id])
+    send_pending_emails.apply_async(countdown=2)
+
     logger.info(f"Sent cancellation notifications for consultation {consultation_id}")
 
 
@@ -120,21 +246,24 @@ def send_booking_rescheduled_notification(consultation_id):
         consultation_id: ID of the consultation
     """
     try:
-        consultation = Consultation.objects.get(id=consultation_id)
+        consultation = _get_consultation(consultation_id)
     except Consultation.DoesNotExist:
         logger.error(f"Consultation {consultation_id} does not exist.")
         return
     
-    # Notify both parties
-    for user in [consultation.student, consultation.professor]:
-        notification = Notification.objects.create(
+    # Notify both parties in one INSERT
+    Notification.objects.bulk_create([
+        Notification(
             user=user,
             consultation=consultation,
             notification_type=NotificationType.IN_APP,
             message_type=MessageType.RESCHEDULED
         )
-        send_email_notification.delay(notification.id)
-    
+        for user in [consultation.student, consultation.professor]
+    ])
+    invalidate_unread_counts([consultation.student_id, consultation.professor_id])
+    send_pending_emails.apply_async(countdown=2)
+
     logger.info(f"Sent reschedule notifications for consultation {consultation_id}")
 
 
@@ -153,69 +282,105 @@ def send_email_notification(notification_id, extra_context=None):
         logger.error(f"Notification {notification_id} does not exist.")
         return
     
-    if notification.notification_type != NotificationType.EMAIL:
-        # Also send email for in-app notifications
-        pass
-    
+    # In-app notifications only ride along as email when the user wants
+    # them; otherwise skip the template render entirely.
+    if (notification.notification_type != NotificationType.EMAIL
+            and not notification.user.email_opt_in):
+        notification.mark_as_sent()
+        return
+
     try:
-        consultation = notification.consultation
-        user = notification.user
-        
-        # Prepare email context
-        context = {
-            'user': user,
-            'consultation': consultation,
-            'message_type': notification.message_type,
-            'site_name': getattr(settings, 'SITE_NAME', 'Consultation System'),
-            'site_url': getattr(settings, 'SITE_URL', 'http://localhost:8000'),
-        }
-        
-        if extra_context:
-            context.update(extra_context)
-        
-        # Get email template based on message type
-        template_map = {
-            MessageType.BOOKING_CREATED: 'emails/booking_created.html',
-            MessageType.BOOKING_CONFIRMED: 'emails/booking_confirmed.html',
-            MessageType.REMINDER_24H: 'emails/reminder_24h.html',
-            MessageType.CANCELLED: 'emails/booking_cancelled.html',
-            MessageType.RESCHEDULED: 'emails/booking_rescheduled.html',
-        }
-        
-        template_name = template_map.get(notification.message_type, 'emails/notification.html')
-        subject_map = {
-            MessageType.BOOKING_CREATED: 'New Consultation Booking',
-            MessageType.BOOKING_CONFIRMED: 'Consultation Confirmed',
-            MessageType.REMINDER_24H: 'Reminder: Consultation Tomorrow',
-            MessageType.CANCELLED: 'Consultation Cancelled',
-            MessageType.RESCHEDULED: 'Consultation Rescheduled',
-        }
-        
-        subject = subject_map.get(notification.message_type, 'Consultation Notification')
-        
-        # Render email
-        html_message = render_to_string(template_name, context)
-        plain_message = render_to_string(template_name.replace('.html', '.txt'), context)
-        
-        # Send email
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        
+        message = _build_email_message(notification, extra_context=extra_context)
+        message.send(fail_silently=False)
+
         # Mark as sent
         notification.mark_as_sent()
-        
-        logger.info(f"Sent email notification {notification_id} to {user.email}")
+
+        logger.info(f"Sent email notification {notification_id} to {notification.user.email}")
     except Exception as e:
         logger.error(f"Failed to send email notification {notification_id}: {str(e)}")
         notification.mark_as_failed()
 
 
+# Guards the PENDING sweep below: every booking task debounces one, so
+# without a lock two overlapping runs select the same rows and send
+# every email twice (rows only flip to SENT after send_messages()).
+_PENDING_SWEEP_LOCK = 'notif:pending_emails:lock'
+_PENDING_SWEEP_LOCK_TTL = 60
+
+
+def _send_pending_batch(batch_size):
+    """Send one batch of PENDING emails; returns the rows selected."""
+    notifications = list(
+        Notification.objects.filter(
+            email_status=EmailStatus.PENDING
+        ).select_related('user', 'consultation')[:batch_size]
+    )
+    if not notifications:
+        return 0
+
+    messages = []
+    buildable = []
+    for notification in notifications:
+        # Opted-out users keep their in-app notification but cost no
+        # template render or SMTP send.
+        if (notification.notification_type != NotificationType.EMAIL
+                and not notification.user.email_opt_in):
+            notification.mark_as_sent()
+            continue
+        try:
+            messages.append(_build_email_message(notification))
+            buildable.append(notification)
+        except Exception as e:
+            logger.error(f"Failed to render notification {notification.id}: {str(e)}")
+            notification.mark_as_failed()
+
+    if not messages:
+        return len(notifications)
+
+    try:
+        connection = get_connection()
+        connection.send_messages(messages)
+    except Exception as e:
+        logger.error(f"Failed to send pending emails: {str(e)}")
+        for notification in buildable:
+            notification.mark_as_failed()
+        return len(notifications)
+
+    for notification in buildable:
+        notification.mark_as_sent()
+
+    logger.info(f"Sent {len(buildable)} pending email notifications")
+    return len(notifications)
+
+
+@shared_task
+def send_pending_emails(batch_size=200):
+    """
+    Send queued notification emails over a single SMTP connection.
+
+    The booking tasks only create PENDING rows and debounce this task;
+    one TLS handshake is then amortized over the whole batch via
+    send_messages(). A cache lock keeps concurrent sweeps from sending
+    the same rows twice.
+
+    Args:
+        batch_size: Maximum notifications to send in one run
+    """
+    if not cache.add(_PENDING_SWEEP_LOCK, 1, _PENDING_SWEEP_LOCK_TTL):
+        # Another worker holds the sweep; it re-enqueues if rows remain.
+        return
+    try:
+        selected = _send_pending_batch(batch_size)
+    finally:
+        cache.delete(_PENDING_SWEEP_LOCK)
+
+    # A full batch means more rows may be waiting; keep draining rather
+    # than leaving them for the next unrelated trigger.
+    if selected >= batch_size:
+        send_pending_emails.apply_async(countdown=1)
+
+
 @shared_task
 def send_24h_reminders():
     """
@@ -223,30 +388,43 @@ def send_24h_reminders():
     Runs periodically via Celery Beat.
     """
     tomorrow = timezone.now() + timedelta(days=1)
-    tomorrow_start = tomorrow.replace(hour=0, minute=0, second=0, microsecond=0)
-    tomorrow_end = tomorrow_start + timedelta(days=1)
-    
+
+    # Plain date+status equality rides the (status, scheduled_date)
+    # index. The old scheduled_time range was midnight-to-midnight -- a
+    # no-op predicate that only blocked index use.
     consultations = Consultation.objects.filter(
         scheduled_date=tomorrow.date(),
-        status__in=[ConsultationStatus.CONFIRMED],
-        scheduled_time__gte=tomorrow_start.time(),
-        scheduled_time__lt=tomorrow_end.time()
-    )
-    
-    for consultation in consultations:
-        # Create notification for both parties
-        for user in [consultation.student, consultation.professor]:
-            notification, created = Notification.objects.get_or_create(
+        status=ConsultationStatus.CONFIRMED
+    ).select_related('student', 'professor')
+
+    # Stream the day's rows instead of materializing them; reminders are
+    # flushed per chunk, so memory stays flat however busy tomorrow is.
+    # The REMINDER_24H-scoped unique constraint drops reminders that
+    # already exist, so no lookup of existing rows is needed.
+    processed = 0
+    reminders = []
+
+    def flush():
+        Notification.objects.bulk_create(reminders, ignore_conflicts=True)
+        invalidate_unread_counts([r.user_id for r in reminders])
+        reminders.clear()
+
+    for consultation in consultations.iterator(chunk_size=500):
+        for user in (consultation.student, consultation.professor):
+            reminders.append(Notification(
                 user=user,
                 consultation=consultation,
-                message_type=MessageType.REMINDER_24H,
-                defaults={
-                    'notification_type': NotificationType.IN_APP,
-                }
-            )
-            
-            if created:
-                send_email_notification.delay(notification.id)
-    
-    logger.info(f"Sent 24-hour reminders for {consultations.count()} consultations")
+                notification_type=NotificationType.IN_APP,
+                message_type=MessageType.REMINDER_24H
+            ))
+        processed += 1
+        if len(reminders) >= 1000:
+            flush()
+
+    if reminders:
+        flush()
+    if processed:
+        send_pending_emails.apply_async(countdown=2)
+
+    logger.info(f"Sent 24-hour reminders for {processed} consultations")
 
@@ -3,28 +3,52 @@ Views for notifications app.
 """
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import filters
 
-from apps.notifications.models import Notification
+from apps.notifications.models import (
+    Notification,
+    invalidate_unread_counts,
+    unread_count_cache_key,
+)
 from apps.notifications.serializers import NotificationSerializer
+from django.core.cache import cache
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from django.utils import timezone
 
 
+class NotificationCursorPagination(CursorPagination):
+    """Keyset pagination over the (user, created_at, id) index.
+
+    Page cost stays flat however many notifications a user has, where
+    offset pagination scans and discards every earlier row.
+    """
+    page_size = 20
+    ordering = ('-created_at', '-id')
+
+
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Notification model (read-only, except mark as read).
     """
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.OrderingFilter]
-    ordering_fields = ['created_at', 'read_at']
-    ordering = ['-created_at']
+    pagination_class = NotificationCursorPagination
     
     def get_queryset(self):
-        """Return notifications for current user."""
-        return Notification.objects.filter(user=self.request.user)
+        """Return notifications for current user.
+
+        The consultation join and the is_read flag both ride the main
+        SELECT so list serialization does no per-row queries.
+        """
+        return Notification.objects.filter(
+            user=self.request.user
+        ).select_related('consultation').annotate(
+            is_read_db=ExpressionWrapper(
+                Q(read_at__isnull=False), output_field=BooleanField()
+            )
+        )
     
     @action(detail=True, methods=['patch'])
     def read(self, request, pk=None):
@@ -37,20 +61,33 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        notification.mark_as_read()
+        if notification.mark_as_read():
+            invalidate_unread_counts([request.user.id])
+        # Keep the queryset annotation in step with the instance state.
+        notification.is_read_db = notification.read_at is not None
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
-    
+
     @action(detail=False, methods=['patch'])
     def mark_all_read(self, request):
         """Mark all notifications as read."""
         notifications = self.get_queryset().filter(read_at__isnull=True)
         updated = notifications.update(read_at=timezone.now())
+        if updated:
+            invalidate_unread_counts([request.user.id])
         return Response({'message': f'{updated} notifications marked as read.'})
-    
+
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
-        """Get count of unread notifications."""
-        count = self.get_queryset().filter(read_at__isnull=True).count()
+        """Get count of unread notifications.
+
+        The badge is polled constantly, so the count is served from
+        cache with a short TTL and busted on every unread-state write.
+        """
+        cache_key = unread_count_cache_key(request.user.id)
+        count = cache.get(cache_key)
+        if count is None:
+            count = self.get_queryset().filter(read_at__isnull=True).count()
+            cache.set(cache_key, count, 10)
         return Response({'unread_count': count})
 
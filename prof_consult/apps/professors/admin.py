@@ -10,6 +10,7 @@ class ProfessorProfileAdmin(admin.ModelAdmin):
     """Admin interface for ProfessorProfile model."""
     list_display = ['user', 'title', 'department', 'office_location', 'consultation_duration_default', 'created_at']
     list_filter = ['department', 'created_at']
+    list_select_related = ('user',)
     search_fields = ['user__email', 'user__first_name', 'user__last_name', 'department', 'title']
     readonly_fields = ['created_at', 'updated_at']
 
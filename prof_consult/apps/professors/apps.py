@@ -6,3 +6,6 @@ class ProfessorsConfig(AppConfig):
     name = 'apps.professors'
     verbose_name = 'Professors'
 
+    def ready(self):
+        from apps.professors import signals  # noqa: F401
+
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def normalize_keys(apps, schema_editor):
+    """Lowercase available_days keys so reads can skip normalization."""
+    ProfessorProfile = apps.get_model('professors', 'ProfessorProfile')
+    batch = []
+    for profile in ProfessorProfile.objects.exclude(available_days={}).iterator():
+        normalized = {
+            day.lower() if isinstance(day, str) else day: slots
+            for day, slots in profile.available_days.items()
+        }
+        if normalized != profile.available_days:
+            profile.available_days = normalized
+            batch.append(profile)
+        if len(batch) >= 2000:
+            ProfessorProfile.objects.bulk_update(batch, ['available_days'])
+            batch = []
+    if batch:
+        ProfessorProfile.objects.bulk_update(batch, ['available_days'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_keys, migrations.RunPython.noop),
+    ]
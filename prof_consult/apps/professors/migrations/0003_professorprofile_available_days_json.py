@@ -0,0 +1,43 @@
+import json
+
+from django.db import migrations, models
+
+
+def backfill_json(apps, schema_editor):
+    """Precompute the JSON string column for existing rows."""
+    ProfessorProfile = apps.get_model('professors', 'ProfessorProfile')
+    batch = []
+    for profile in ProfessorProfile.objects.only(
+        'id', 'available_days'
+    ).iterator():
+        profile.available_days_json = json.dumps(
+            profile.available_days or {}, separators=(',', ':')
+        )
+        batch.append(profile)
+        if len(batch) >= 2000:
+            ProfessorProfile.objects.bulk_update(batch, ['available_days_json'])
+            batch = []
+    if batch:
+        ProfessorProfile.objects.bulk_update(batch, ['available_days_json'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('professors', '0002_normalize_available_days_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='professorprofile',
+            name='available_days_json',
+            field=models.TextField(
+                default='{}',
+                editable=False,
+                help_text='Precomputed JSON encoding of available_days, '
+                          'kept in sync by save(); lets renderers emit the '
+                          'schedule without re-encoding it per request',
+            ),
+        ),
+        migrations.RunPython(backfill_json, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,104 @@ Professor profile models for consultation scheduling.
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
+from functools import lru_cache
 import json
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(obj):
+    """Serialize to a compact JSON string, via orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+# Shared empty result for days with no availability; avoids allocating
+# a fresh list per miss on the hot lookup path.
+_NO_SLOTS = ()
+
+
+@lru_cache(maxsize=16)
+def _norm_day(day):
+    """Canonicalize a day name; only seven values ever recur."""
+    return day.lower() if isinstance(day, str) else day
+
+
+def _normalize_days(available_days):
+    """Lowercase the day keys of an available_days mapping."""
+    return {_norm_day(day): slots for day, slots in available_days.items()}
+
+
+def _time_to_sec(value):
+    """Convert an 'HH:MM' string to seconds since midnight."""
+    hours, _, minutes = str(value).strip().partition(':')
+    return int(hours) * 3600 + int(minutes or 0) * 60
+
+
+def _slot_seconds(slot, default_duration):
+    """Parse one JSON slot into a (start_sec, end_sec) pair.
+
+    Accepts the loose shapes stored in available_days: a bare start
+    time ('09:00'), a range ('09:00-10:00') or a {'start', 'end'}
+    dict. A slot without an end runs for the default duration.
+    """
+    if isinstance(slot, dict):
+        start, end = slot.get('start'), slot.get('end')
+    elif isinstance(slot, str) and '-' in slot:
+        start, end = slot.split('-', 1)
+    else:
+        start, end = slot, None
+    start_sec = _time_to_sec(start)
+    end_sec = _time_to_sec(end) if end else start_sec + default_duration * 60
+    return start_sec, end_sec
+
+
+MINUTES_PER_DAY = 1440
+
+
+def intervals_to_mask(pairs):
+    """Pack (start_sec, end_sec) pairs into a minute-per-bit day mask.
+
+    A day is one 1440-bit integer, so combining schedules is a single
+    C-level big-int op instead of nested interval loops.
+    """
+    mask = 0
+    for start_sec, end_sec in pairs:
+        start = max(0, start_sec // 60)
+        end = min(MINUTES_PER_DAY, -(-end_sec // 60))
+        if end > start:
+            mask |= ((1 << (end - start)) - 1) << start
+    return mask
+
+
+def mask_to_intervals(mask):
+    """Unpack a minute bitmap into ('HH:MM', 'HH:MM') pairs."""
+    intervals = []
+    while mask:
+        start = (mask & -mask).bit_length() - 1
+        shifted = mask >> start
+        run = (~shifted & (shifted + 1)).bit_length() - 1
+        intervals.append((
+            f'{start // 60:02d}:{start % 60:02d}',
+            f'{(start + run) // 60:02d}:{(start + run) % 60:02d}',
+        ))
+        mask &= ~(((1 << run) - 1) << start)
+    return intervals
+
+
+def day_mask(slots, default_duration):
+    """Build the availability bitmap for one day's JSON slots."""
+    pairs = []
+    for slot in slots:
+        try:
+            pairs.append(_slot_seconds(slot, default_duration))
+        except (TypeError, ValueError):
+            continue
+    return intervals_to_mask(pairs)
+
 
 class ProfessorProfile(models.Model):
     """
@@ -18,6 +114,7 @@ class ProfessorProfile(models.Model):
         office_location: Office location for consultations
         consultation_duration_default: Default consultation duration in minutes
         available_days: JSON field with day/time slots for availability
+        available_days_json: Precomputed JSON encoding of available_days
         max_advance_booking_days: Maximum days in advance students can book
         buffer_time_between_consultations: Buffer time between consultations in minutes
     """
@@ -55,6 +152,13 @@ class ProfessorProfile(models.Model):
         blank=True,
         help_text="JSON field with day/time slots for availability"
     )
+    available_days_json = models.TextField(
+        default='{}',
+        editable=False,
+        help_text="Precomputed JSON encoding of available_days, kept in "
+                  "sync by save(); lets renderers emit the schedule "
+                  "without re-encoding it per request"
+    )
     max_advance_booking_days = models.PositiveIntegerField(
         default=30,
         validators=[MinValueValidator(1), MaxValueValidator(365)],
@@ -81,20 +185,58 @@ class ProfessorProfile(models.Model):
         title = f"{self.title} " if self.title else ""
         return f"{title}{self.user.get_full_name() or self.user.email}"
     
+    def save(self, *args, **kwargs):
+        """Normalize available_days keys to lowercase before persisting.
+
+        Writes are rare and reads are hot: canonicalizing here lets
+        get_available_slots be a bare dict hit with no string ops.
+        """
+        if self.available_days:
+            self.available_days = _normalize_days(self.available_days)
+        self.available_days_json = _dumps(self.available_days or {})
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'available_days' in update_fields:
+            kwargs['update_fields'] = (
+                list(update_fields) + ['available_days_json']
+            )
+        super().save(*args, **kwargs)
+
     def get_available_slots(self, day_of_week):
-        """Get available time slots for a specific day of week."""
+        """Get available time slots for a day (canonical lowercase key)."""
         if not self.available_days:
-            return []
-        day_name = day_of_week.lower() if isinstance(day_of_week, str) else day_of_week
-        return self.available_days.get(day_name, [])
-    
+            return _NO_SLOTS
+        return self.available_days.get(day_of_week, _NO_SLOTS)
+
     def set_available_slots(self, day_of_week, slots):
         """Set available time slots for a specific day of week."""
         if not self.available_days:
             self.available_days = {}
-        day_name = day_of_week.lower() if isinstance(day_of_week, str) else day_of_week
-        self.available_days[day_name] = slots
-        self.save()
+        self.available_days[_norm_day(day_of_week)] = slots
+        self.save(update_fields=['available_days', 'updated_at'])
+
+    @classmethod
+    def bulk_set_available(cls, profile_days_map):
+        """Set available_days for many profiles in one round-trip.
+
+        Args:
+            profile_days_map: mapping of profile id to available_days dict
+
+        Returns:
+            Number of profiles updated
+        """
+        profiles = []
+        for profile_id, days in profile_days_map.items():
+            days = _normalize_days(days)
+            profiles.append(cls(
+                id=profile_id,
+                available_days=days,
+                available_days_json=_dumps(days),
+            ))
+        if profiles:
+            cls.objects.bulk_update(
+                profiles, ['available_days', 'available_days_json']
+            )
+        return len(profiles)
     
     def get_full_name(self):
         """Get professor's full name."""
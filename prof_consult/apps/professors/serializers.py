@@ -1,14 +1,41 @@
 """
 Serializers for professors app.
 """
+import copy
+
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from apps.professors.models import ProfessorProfile
 from apps.accounts.serializers import UserSerializer
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class CachedFieldsMixin:
+    """Memoize get_fields() per serializer class.
+
+    ModelSerializer.get_fields() re-runs model introspection for every
+    serializer instance. The field map only depends on the class, so it
+    is built once and fresh copies are handed out for binding; Field
+    defines __deepcopy__ as reconstruction from its constructor args,
+    which is much cheaper than introspection.
+    """
+    _fields_cache = {}
 
-class ProfessorProfileSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        cls = self.__class__
+        fields = self._fields_cache.get(cls)
+        if fields is None:
+            fields = self._fields_cache[cls] = super().get_fields()
+        return {name: copy.deepcopy(field) for name, field in fields.items()}
+
+
+class ProfessorProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for ProfessorProfile model."""
-    
+
     user = UserSerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
     email = serializers.SerializerMethodField()
@@ -22,13 +49,48 @@ class ProfessorProfileSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'full_name', 'email'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
-    
+
+    @cached_property
+    def fields(self):
+        """Shadow DRF's fields property with a per-instance cache.
+
+        to_representation touches fields repeatedly per object; after
+        the first access this resolves from the instance __dict__
+        instead of going back through the property descriptor.
+        """
+        return super().fields
+
+    def to_representation(self, instance):
+        """Splice the precomputed available_days JSON when orjson renders.
+
+        The model keeps an already-serialized copy of available_days;
+        orjson.Fragment lets the renderer emit it verbatim instead of
+        re-encoding the same dict on every request. Other renderers
+        get the plain dict as before.
+        """
+        ret = super().to_representation(instance)
+        if orjson is not None and 'available_days' in ret:
+            renderer = getattr(
+                self.context.get('request'), 'accepted_renderer', None
+            )
+            if type(renderer).__name__ == 'ORJSONRenderer':
+                ret['available_days'] = orjson.Fragment(
+                    instance.available_days_json
+                )
+        return ret
+
     def get_full_name(self, obj):
-        """Get professor's full name."""
+        """Get professor's full name, preferring the queryset annotation."""
+        annotated = getattr(obj, 'annotated_full_name', None)
+        if annotated is not None:
+            return annotated
         return obj.get_full_name()
-    
+
     def get_email(self, obj):
-        """Get professor's email."""
+        """Get professor's email, preferring the queryset annotation."""
+        annotated = getattr(obj, 'annotated_email', None)
+        if annotated is not None:
+            return annotated
         return obj.user.email
 
 
@@ -39,7 +101,7 @@ class ProfessorProfileDetailSerializer(ProfessorProfileSerializer):
         fields = ProfessorProfileSerializer.Meta.fields
 
 
-class AvailabilitySerializer(serializers.Serializer):
+class AvailabilitySerializer(CachedFieldsMixin, serializers.Serializer):
     """Serializer for updating availability."""
     
     available_days = serializers.DictField(
@@ -0,0 +1,53 @@
+"""
+Cache helpers and invalidation signals for professor availability.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.consultations.models import Consultation
+from apps.professors.models import ProfessorProfile
+
+# How long a cached availability response may live. Write paths that
+# bypass the ORM signals (queryset update() transitions) are bounded by
+# this TTL rather than invalidated eagerly.
+AVAILABILITY_CACHE_TTL = 60
+
+
+def _version_key(user_id):
+    return f'avail:ver:{user_id}'
+
+
+def availability_cache_key(user_id, target_date):
+    """Cache key for one professor's availability on one date.
+
+    The key embeds a per-professor version counter, so a schedule
+    change invalidates every cached date for that professor at once
+    without enumerating the dated keys.
+    """
+    version = cache.get(_version_key(user_id), 0)
+    return f'avail:{user_id}:{version}:{target_date.isoformat()}'
+
+
+def bump_availability_version(user_id):
+    """Invalidate all cached availability responses for a professor."""
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, None)
+
+
+@receiver(post_save, sender=Consultation)
+@receiver(post_delete, sender=Consultation)
+def invalidate_availability_for_consultation(sender, instance, **kwargs):
+    """Drop the cached availability for a booking's professor and date."""
+    if instance.scheduled_date:
+        cache.delete(
+            availability_cache_key(instance.professor_id, instance.scheduled_date)
+        )
+
+
+@receiver(post_save, sender=ProfessorProfile)
+def invalidate_availability_for_profile(sender, instance, **kwargs):
+    """Drop all cached availability when a professor's schedule changes."""
+    bump_availability_version(instance.user_id)
@@ -1,12 +1,16 @@
 """
 Tests for professors app.
 """
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from rest_framework import status
 
-from apps.professors.models import ProfessorProfile
+from apps.professors.models import (
+    ProfessorProfile, intervals_to_mask, mask_to_intervals
+)
+from apps.professors.signals import availability_cache_key
 
 User = get_user_model()
 
@@ -51,3 +55,41 @@ class ProfessorProfileModelTest(TestCase):
         self.profile.set_available_slots('monday', slots)
         self.assertEqual(self.profile.get_available_slots('monday'), slots)
 
+    def test_available_days_json_kept_in_sync(self):
+        """save() refreshes the precomputed JSON string column."""
+        import json
+        self.profile.available_days = {'Monday': ['09:00']}
+        self.profile.save(update_fields=['available_days', 'updated_at'])
+        self.profile.refresh_from_db()
+        self.assertEqual(
+            json.loads(self.profile.available_days_json),
+            {'monday': ['09:00']},
+        )
+
+    def test_mask_interval_round_trip(self):
+        """Interval pairs survive the bitmap round trip."""
+        mask = intervals_to_mask([(9 * 3600, 10 * 3600), (14 * 3600, 15 * 3600)])
+        self.assertEqual(
+            mask_to_intervals(mask),
+            [('09:00', '10:00'), ('14:00', '15:00')],
+        )
+
+    def test_full_name_falls_back_to_email_for_blank_names(self):
+        """A professor with no names serializes full_name as the email."""
+        from rest_framework.test import APIClient
+        response = APIClient().get('/api/professors/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = response.data['results'][0]
+        self.assertEqual(row['full_name'], 'professor@example.com')
+
+    def test_availability_cache_invalidated_on_save(self):
+        """Saving the profile rotates the availability cache keys."""
+        from datetime import date
+        target = date(2026, 9, 1)
+        key_before = availability_cache_key(self.user.id, target)
+        cache.set(key_before, {'stale': True}, 60)
+        self.profile.save()
+        key_after = availability_cache_key(self.user.id, target)
+        self.assertNotEqual(key_before, key_after)
+        self.assertIsNone(cache.get(key_after))
+
@@ -5,12 +5,23 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.throttling import ScopedRateThrottle
 from rest_framework import filters
-from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+from django.db import connection
+from django.db.models import ExpressionWrapper, F, IntegerField, Q, Value
+from django.db.models.functions import Concat, NullIf, Trim
 from django.utils import timezone
-from datetime import timedelta, datetime as dt
+from datetime import date, timedelta, datetime as dt
 
-from apps.professors.models import ProfessorProfile
+from django.core.cache import cache
+
+from apps.professors.models import (
+    MINUTES_PER_DAY, ProfessorProfile, day_mask, mask_to_intervals
+)
+from apps.professors.signals import (
+    AVAILABILITY_CACHE_TTL, availability_cache_key
+)
 from apps.professors.serializers import (
     ProfessorProfileSerializer, ProfessorProfileDetailSerializer,
     AvailabilitySerializer
@@ -19,22 +30,82 @@ from apps.accounts.permissions import IsProfessor, IsProfessorOrReadOnly
 from apps.consultations.models import Consultation, ConsultationStatus
 
 
+class ProfessorFilter(FilterSet):
+    """Filterset declared at import time.
+
+    With bare filterset_fields, django-filter re-derives the filterset
+    class from model introspection on every request; an explicit class
+    is built once.
+    """
+    class Meta:
+        model = ProfessorProfile
+        fields = ['department']
+
+
 class ProfessorProfileViewSet(viewsets.ModelViewSet):
     """
     ViewSet for ProfessorProfile model.
     """
-    queryset = ProfessorProfile.objects.select_related('user').all()
+    # full_name/email come back computed by the database so the
+    # serializer reads plain attributes instead of walking the user
+    # relation per row. Blank names collapse to NULL (rather than the
+    # bare joining space) so the serializer's email fallback still
+    # applies.
+    queryset = ProfessorProfile.objects.select_related('user').annotate(
+        annotated_full_name=NullIf(
+            Trim(Concat('user__first_name', Value(' '), 'user__last_name')),
+            Value(''),
+        ),
+        annotated_email=F('user__email'),
+    )
     serializer_class = ProfessorProfileSerializer
     permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['department']
+    filterset_class = ProfessorFilter
     search_fields = ['user__first_name', 'user__last_name', 'user__email', 'department', 'title']
     ordering_fields = ['user__last_name', 'created_at']
     ordering = ['user__last_name']
-    
+    # Read by the ScopedRateThrottle that only the availability action
+    # installs; the other actions keep the global anon/user throttles.
+    throttle_scope = 'availability'
+
+    def filter_queryset(self, queryset):
+        """Skip the filter backends when no filter params are present.
+
+        The common anonymous list request carries no query string, so
+        there is nothing for the backends to do; ordering falls back to
+        the model/viewset default either way.
+        """
+        if not (self.request.query_params.keys()
+                & {'department', 'search', 'ordering'}):
+            return queryset
+        return super().filter_queryset(queryset)
+
+    def get_queryset(self):
+        """Narrow the list SELECT to the serialized columns.
+
+        The user join otherwise drags in every column, including the
+        encrypted Google tokens which cost a decryption per row; the
+        list payload needs none of that.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id', 'title', 'department', 'office_location',
+                'consultation_duration_default', 'available_days',
+                'available_days_json', 'max_advance_booking_days',
+                'buffer_time_between_consultations',
+                'created_at', 'updated_at',
+                'user__id', 'user__email', 'user__username',
+                'user__first_name', 'user__last_name', 'user__role',
+                'user__profile_picture', 'user__department', 'user__bio',
+                'user__email_opt_in', 'user__created_at', 'user__updated_at',
+            )
+        return queryset
+
     def get_serializer_class(self):
         """Return appropriate serializer class."""
-        if self.action == 'retrieve' or self.action == 'availability':
+        if self.action == 'retrieve':
             return ProfessorProfileDetailSerializer
         return ProfessorProfileSerializer
     
@@ -44,10 +115,10 @@ class ProfessorProfileViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), IsProfessorOrReadOnly()]
         return super().get_permissions()
     
-    @action(detail=True, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=True, methods=['get'], permission_classes=[AllowAny],
+            throttle_classes=[ScopedRateThrottle])
     def availability(self, request, pk=None):
         """Get professor's available time slots."""
-        professor = self.get_object()
         date_str = request.query_params.get('date')
         
         if not date_str:
@@ -57,43 +128,141 @@ class ProfessorProfileViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            target_date = timezone.datetime.strptime(date_str, '%Y-%m-%d').date()
+            # fromisoformat is the C fast path; strptime re-parses the
+            # format string per call.
+            target_date = date.fromisoformat(date_str)
         except ValueError:
             return Response(
                 {'error': 'Invalid date format. Use YYYY-MM-DD'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Get day of week
+
+        # The endpoint is idempotent and hammered while a student picks
+        # a slot; serve repeats from cache. Signals invalidate on
+        # booking and schedule changes. The pk->user mapping never
+        # changes, so it is cached long and lets a warm hit answer
+        # without touching the database at all.
+        user_id = cache.get(f'avail:uid:{pk}')
+        if user_id is not None:
+            cached = cache.get(availability_cache_key(user_id, target_date))
+            if cached is not None:
+                return Response(cached)
+
+        # The whole payload is hand-built, so skip get_object() and the
+        # model serializer machinery and read the few needed columns as
+        # a plain dict. On PostgreSQL the day's booked consultations are
+        # aggregated into the same row, fusing the two lookups into one
+        # round-trip; other backends fall back to a second query.
+        profile_cols = (
+            'id', 'user_id', 'user__first_name', 'user__last_name',
+            'user__email', 'available_days',
+            'consultation_duration_default',
+            'buffer_time_between_consultations',
+        )
+        statuses = [ConsultationStatus.PENDING, ConsultationStatus.CONFIRMED]
+        fused = connection.vendor == 'postgresql'
+        if fused:
+            from django.contrib.postgres.aggregates import ArrayAgg
+
+            booked = Q(
+                user__professor_consultations__scheduled_date=target_date,
+                user__professor_consultations__status__in=statuses,
+            )
+            professor = ProfessorProfile.objects.filter(pk=pk).annotate(
+                booked_times=ArrayAgg(
+                    'user__professor_consultations__scheduled_time',
+                    filter=booked,
+                    ordering='user__professor_consultations__scheduled_time',
+                ),
+                booked_durations=ArrayAgg(
+                    'user__professor_consultations__duration',
+                    filter=booked,
+                    ordering='user__professor_consultations__scheduled_time',
+                ),
+            ).values(*profile_cols, 'booked_times', 'booked_durations').first()
+        else:
+            professor = ProfessorProfile.objects.filter(pk=pk).values(
+                *profile_cols
+            ).first()
+        if professor is None:
+            return Response(
+                {'error': 'Professor profile not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        cache.set(f'avail:uid:{pk}', professor['user_id'], 3600)
+        cache_key = availability_cache_key(professor['user_id'], target_date)
+
+        # Get day of week; stored keys are canonical lowercase.
         day_name = target_date.strftime('%A').lower()
-        available_slots = professor.get_available_slots(day_name)
-        
-        # Get existing consultations for this date
-        existing_consultations = Consultation.objects.filter(
-            professor=professor.user,
-            scheduled_date=target_date,
-            status__in=[ConsultationStatus.PENDING, ConsultationStatus.CONFIRMED]
-        ).values_list('scheduled_time', 'duration')
-        
-        # Calculate booked slots
-        booked_slots = []
-        buffer = professor.buffer_time_between_consultations
-        
-        for time, duration in existing_consultations:
-            start = time
-            end_time = (timezone.datetime.combine(target_date, start) + 
-                       timedelta(minutes=duration + buffer)).time()
-            booked_slots.append({'start': start.isoformat(), 'end': end_time.isoformat()})
+        available_slots = (professor['available_days'] or {}).get(day_name, [])
+
+        # Blocked spans as (start time, minutes blocked) pairs; the
+        # span length (duration + buffer) comes summed from the
+        # database on the two-query path.
+        buffer = professor['buffer_time_between_consultations']
+        if fused:
+            booked_pairs = [
+                (start, duration + buffer)
+                for start, duration in zip(
+                    professor['booked_times'] or (),
+                    professor['booked_durations'] or (),
+                )
+            ]
+        else:
+            booked_pairs = list(Consultation.objects.filter(
+                professor_id=professor['user_id'],
+                scheduled_date=target_date,
+                status__in=statuses
+            ).annotate(
+                end_offset=ExpressionWrapper(
+                    F('duration') + Value(buffer), output_field=IntegerField()
+                )
+            ).values_list('scheduled_time', 'end_offset'))
+
+        booked_slots = [
+            {
+                'start': start.isoformat(),
+                'end': (
+                    timezone.datetime.combine(target_date, start)
+                    + timedelta(minutes=offset)
+                ).time().isoformat(),
+            }
+            for start, offset in booked_pairs
+        ]
         
-        return Response({
-            'professor_id': professor.id,
-            'professor_name': professor.get_full_name(),
+        # Free time falls out branchlessly: one bit per minute of the
+        # day, free = available & ~booked as single big-int ops.
+        available_mask = day_mask(
+            available_slots, professor['consultation_duration_default']
+        )
+        booked_mask = 0
+        for start, offset in booked_pairs:
+            start_minute = start.hour * 60 + start.minute
+            span = min(offset, MINUTES_PER_DAY - start_minute)
+            if span > 0:
+                booked_mask |= ((1 << span) - 1) << start_minute
+        free_slots = [
+            {'start': s, 'end': e}
+            for s, e in mask_to_intervals(available_mask & ~booked_mask)
+        ]
+
+        full_name = (
+            f"{professor['user__first_name']} {professor['user__last_name']}".strip()
+            or professor['user__email']
+        )
+        data = {
+            'professor_id': professor['id'],
+            'professor_name': full_name,
             'date': target_date.isoformat(),
             'available_slots': available_slots,
             'booked_slots': booked_slots,
-            'consultation_duration_default': professor.consultation_duration_default,
-            'buffer_time': professor.buffer_time_between_consultations
-        })
+            'free_slots': free_slots,
+            'consultation_duration_default': professor['consultation_duration_default'],
+            'buffer_time': buffer
+        }
+        cache.set(cache_key, data, AVAILABILITY_CACHE_TTL)
+        return Response(data)
     
     @action(detail=True, methods=['put'], permission_classes=[IsAuthenticated, IsProfessor])
     def update_availability(self, request, pk=None):
@@ -111,7 +280,7 @@ class ProfessorProfileViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         
         professor.available_days = serializer.validated_data['available_days']
-        professor.save()
+        professor.save(update_fields=['available_days', 'updated_at'])
         
         return Response({
             'message': 'Availability updated successfully.',
@@ -68,6 +68,10 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # allauth refuses to start unless this exact path is present, so it
+    # cannot be wrapped in a prefix gate; its per-request work is a
+    # namespace attach plus a context manager, with redirect handling
+    # only on accounts responses.
     'allauth.account.middleware.AccountMiddleware',
 ]
 
@@ -99,6 +103,10 @@ try:
         'default': dj_database_url.config(
             default=database_url,
             conn_max_age=600,
+            # Ping pooled connections before reuse so a connection that
+            # died during its 600s lifetime doesn't surface as a
+            # mid-request error and reconnect.
+            conn_health_checks=True,
         )
     }
 except Exception:
@@ -107,6 +115,7 @@ except Exception:
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 
@@ -218,6 +227,21 @@ REST_FRAMEWORK = {
     'TIME_FORMAT': '%H:%M:%S',
 }
 
+# Outside DEBUG the API serves JSON only: the browsable renderer costs
+# template rendering and content negotiation per request. When the
+# optional orjson renderer is installed, its C encoder replaces DRF's
+# Python JSONRenderer.
+if not DEBUG:
+    try:
+        import drf_orjson_renderer  # noqa: F401
+        REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+            'drf_orjson_renderer.renderers.ORJSONRenderer',
+        ]
+    except ImportError:
+        REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+            'rest_framework.renderers.JSONRenderer',
+        ]
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -321,4 +345,7 @@ REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'] = [
 REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = {
     'anon': '100/hour',
     'user': '1000/hour',
+    # Public availability endpoint gets its own tighter bucket; see the
+    # ScopedRateThrottle on ProfessorProfileViewSet.availability.
+    'availability': '30/min',
 }
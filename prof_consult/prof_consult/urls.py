@@ -2,6 +2,7 @@
 URL configuration for prof_consult project.
 """
 from django.contrib import admin
+from django.shortcuts import render
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
@@ -14,6 +15,12 @@ from apps.professors.views import ProfessorProfileViewSet
 from apps.notifications.views import NotificationViewSet
 from apps.accounts import views as auth_views
 
+
+def home(request):
+    """Render the landing page."""
+    return render(request, 'home.html')
+
+
 # API Router
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -25,7 +32,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     
     # Home page
-    path('', lambda request: __import__('django.shortcuts', fromlist=['render']).render(request, 'home.html'), name='home'),
+    path('', home, name='home'),
     
     # API URLs
     path('api/', include(router.urls)),
@@ -43,6 +50,7 @@ urlpatterns = [
     # Admin API endpoints
     path('api/admin/users/', auth_views.AdminUserListView.as_view(), name='admin-users'),
     path('api/admin/consultations/', auth_views.AdminConsultationListView.as_view(), name='admin-consultations'),
+    path('api/admin/consultations/export/', auth_views.AdminConsultationExportView.as_view(), name='admin-consultations-export'),
     path('api/admin/statistics/', auth_views.AdminStatisticsView.as_view(), name='admin-statistics'),
     path('api/admin/users/<int:pk>/role/', auth_views.AdminUpdateUserRoleView.as_view(), name='admin-update-role'),
 ]